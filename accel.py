@@ -0,0 +1,154 @@
+''' optional vectorized backend for large CSR snapshots. when numpy and scipy can be
+    imported, max flow is solved by scipy.sparse.csgraph.maximum_flow and dependency
+    waves, topological order and reachability expand a whole frontier of vertices
+    per numpy operation instead of one vertex per loop iteration. every function
+    works on integer indices and the snapshot falls back to its pure python code
+    when the backend is missing, the snapshot is small or a function returns None
+'''
+from array import array
+
+numpy = None
+csr_matrix = None
+maximum_flow = None
+breadth_first_order = None
+#None until the first large snapshot asks for the backend, importing numpy and
+#scipy takes longer than most small graphs take to solve
+available = None
+
+#below this many arcs setting up the arrays costs more than the python loops
+MIN_ARCS = 10000
+#scipy keeps capacities as 32 bit integers
+MAX_CAPACITY = 2 ** 31 - 1
+
+def use(network):
+    ''' returns true if the snapshot is large enough to gain from the backend and it
+        is available, numpy and scipy are only imported the first time that is asked
+    '''
+    if len(network.targets) < MIN_ARCS:
+        return False
+    if available is None:
+        load_helper()
+    return available
+
+def load_helper():
+    ''' import numpy and scipy, setting available to whether they could be imported '''
+    global numpy, csr_matrix, maximum_flow, breadth_first_order, available
+    try:
+        import numpy
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import maximum_flow, breadth_first_order
+        available = True
+    except ImportError:
+        available = False
+
+def arrays_helper(network):
+    ''' returns the offsets and targets of a snapshot as numpy arrays, without a copy
+        for array and memory mapped snapshots
+    '''
+    return numpy.asarray(network.offsets, dtype=numpy.int64), numpy.asarray(network.targets, dtype=numpy.int64)
+
+def gather_helper(offsets, frontier):
+    ''' returns the positions in the targets array of every arc out of the frontier '''
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    shift = numpy.repeat(starts - (numpy.cumsum(counts) - counts), counts)
+    return numpy.arange(int(counts.sum())) + shift
+
+def levels(network):
+    ''' returns the dependency waves of a snapshot as a list of index arrays, the same
+        waves as Graph.levels with each wave in index order
+    '''
+    offsets, targets = arrays_helper(network)
+    n = len(offsets) - 1
+    outdegree = numpy.diff(offsets)
+    #reverse adjacency, the tails of the arcs grouped by their target
+    tails = numpy.repeat(numpy.arange(n), outdegree)[numpy.argsort(targets, kind='stable')]
+    reverse = numpy.zeros(n + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(targets, minlength=n), out=reverse[1:])
+    remaining = outdegree.copy()
+    wave = numpy.flatnonzero(remaining == 0)
+    waves = []
+    while wave.size:
+        waves.append(wave)
+        done = numpy.bincount(tails[gather_helper(reverse, wave)], minlength=n)
+        remaining -= done
+        wave = numpy.flatnonzero((done > 0) & (remaining == 0))
+    return waves
+
+def topological_sort(network):
+    ''' returns the indices of a snapshot in an order of resolution of dependencies,
+        the waves one after another, None if the snapshot has a cycle
+    '''
+    waves = levels(network)
+    order = numpy.concatenate(waves) if waves else numpy.zeros(0, dtype=numpy.int64)
+    if len(order) < len(network.offsets) - 1:
+        return None
+    return order.tolist()
+
+def is_cyclic(network):
+    ''' returns true if some vertex never joins a dependency wave '''
+    return sum([len(wave) for wave in levels(network)]) < len(network.offsets) - 1
+
+def reachable(network, starts):
+    ''' returns the sorted indices reachable from the start indices, including them '''
+    offsets, targets = arrays_helper(network)
+    seen = numpy.zeros(len(offsets) - 1, dtype=bool)
+    frontier = numpy.unique(numpy.asarray(starts, dtype=numpy.int64))
+    seen[frontier] = True
+    while frontier.size:
+        found = targets[gather_helper(offsets, frontier)]
+        frontier = numpy.unique(found[~seen[found]])
+        seen[frontier] = True
+    return numpy.flatnonzero(seen).tolist()
+
+def solve(network, sources, sinks):
+    ''' returns the max flow between the source and sink indices computed by scipy as
+        its value, the flow on every arc parallel to the targets and the flags of the
+        source side of a minimum cut, the same as CSR.solve reads off its residual.
+        None if some capacity is not a finite non-negative integer or a sum of them
+        does not fit in 32 bits
+    '''
+    capacities = numpy.asarray(network.capacities, dtype=numpy.float64)
+    if capacities.size and not (numpy.isfinite(capacities).all() and (capacities >= 0).all() and (capacities == numpy.floor(capacities)).all()):
+        return None
+    offsets, targets = arrays_helper(network)
+    n = len(offsets) - 1
+    tails = numpy.repeat(numpy.arange(n), numpy.diff(offsets))
+    sources = numpy.asarray(sources, dtype=numpy.int64)
+    sinks = numpy.asarray(sinks, dtype=numpy.int64)
+    #the super source and sink arcs are bounded by the node's capacity, like residual()
+    outflow = numpy.bincount(tails, weights=capacities, minlength=n)[sources]
+    inflow = numpy.bincount(targets, weights=capacities, minlength=n)[sinks]
+    if max([capacities.max(initial=0), outflow.max(initial=0), inflow.max(initial=0)]) > MAX_CAPACITY:
+        return None
+    #loops carry no flow
+    keep = tails != targets
+    rows = numpy.concatenate([tails[keep], numpy.full(len(sources), n), sinks])
+    columns = numpy.concatenate([targets[keep], sources, numpy.full(len(sinks), n + 1)])
+    data = numpy.concatenate([capacities[keep], outflow, inflow]).astype(numpy.int32)
+    #parallel arcs are summed into one matrix entry
+    matrix = csr_matrix((data, (rows, columns)), shape=(n + 2, n + 2))
+    result = maximum_flow(matrix, n, n + 1)
+    #scipy returns the net flow between every pair of nodes, it is handed out to the
+    #parallel arcs of a pair in order, each taking up to its capacity
+    net = numpy.asarray(result.flow[tails, targets], dtype=numpy.float64).ravel()
+    net[~keep] = 0
+    m = len(targets)
+    order = numpy.lexsort((targets, tails))
+    ordered = capacities[order]
+    first = numpy.ones(m, dtype=bool)
+    first[1:] = (numpy.diff(tails[order]) != 0) | (numpy.diff(targets[order]) != 0)
+    taken = numpy.cumsum(ordered) - ordered
+    taken -= taken[numpy.maximum.accumulate(numpy.where(first, numpy.arange(m), 0))]
+    flows = numpy.zeros(m)
+    flows[order] = numpy.clip(net[order] - taken, 0, ordered)
+    #the sink side of the cut is every node that can still reach the super sink
+    residual = (matrix - result.flow).tocsr()
+    residual.data = (residual.data > 0).astype(numpy.int8)
+    residual.eliminate_zeros()
+    reaches = breadth_first_order(residual.T.tocsr(), n + 1, directed=True, return_predecessors=False)
+    side = numpy.ones(n + 2, dtype=bool)
+    side[reaches] = False
+    side[sources] = True
+    side[sinks] = False
+    return float(result.flow_value), array('d', flows.tobytes()), bytearray(side[:n].tobytes())
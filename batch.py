@@ -0,0 +1,105 @@
+''' batch analysis of many dependency graph and flow network files on a process
+    pool. every file is analyzed in a worker process and its result is written as
+    one JSON object per line in the order the files finish. only a bounded number
+    of files are in flight at a time, so the file names can be streamed and memory
+    does not grow with the number of files
+'''
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import edgelist
+import csrfile
+
+def is_flow_file(filename):
+    ''' returns true if the file holds a flow network rather than a dependency graph,
+        judged by its extension or, for binary csr files, by its capacities
+    '''
+    if filename.endswith('.flw') or filename.endswith('.max'):
+        return True
+    if csrfile.is_csr_file(filename):
+        return csrfile.open_csr(filename).capacities is not None
+    return False
+
+def analyze(filename):
+    ''' returns a dictionary with the analysis of one file. a dependency graph gets
+        whether it is cyclic and, if it is not, its topological sort, a flow network
+        gets its max flow. binary files are queried in place as CSR snapshots, which
+        answer the same questions as a Graph or Flow. errors are reported in the
+        dictionary instead of raised so one bad file does not stop the batch
+    '''
+    result = {'file': filename}
+    try:
+        if csrfile.is_csr_file(filename):
+            network = csrfile.open_csr(filename)
+            flow = network.capacities is not None
+        elif is_flow_file(filename):
+            network = edgelist.load_flow(filename)
+            flow = True
+        else:
+            network = edgelist.load_graph(filename)
+            flow = False
+        if flow:
+            result['kind'] = 'flow'
+            result['nodes'] = network.order()
+            result['arcs'] = network.size()
+            result['max_flow'] = network.max_flow()
+        else:
+            result['kind'] = 'graph'
+            result['vertices'] = network.order()
+            result['edges'] = network.size()
+            result['cyclic'] = network.is_cyclic()
+            if result['cyclic']:
+                result['order'] = None
+            else:
+                result['order'] = [str(v) for v in network.topological_sort()]
+    except Exception as error:
+        result['error'] = str(error)
+    return result
+
+def line_helper(result):
+    ''' returns the JSON line of an analysis. JSON has no infinity or nan, so a non
+        finite number such as the max flow over an arc of infinite capacity is
+        written as the string "inf", "-inf" or "nan"
+    '''
+    return json.dumps(finite_helper(result), allow_nan=False) + '\n'
+
+def finite_helper(value):
+    ''' returns value with every non finite float replaced by its string '''
+    if isinstance(value, float) and not math.isfinite(value):
+        return str(value)
+    if isinstance(value, dict):
+        return dict([(key, finite_helper(item)) for key, item in value.items()])
+    if isinstance(value, list):
+        return [finite_helper(item) for item in value]
+    return value
+
+def run(filenames, out, workers=None):
+    ''' analyze every file of an iterable of file names on a pool of worker processes,
+        writing a JSON line per file to out as soon as it finishes. at most twice
+        as many files as workers are in flight. returns the number of files that
+        failed
+    '''
+    if workers is None:
+        workers = os.cpu_count() or 1
+    failed = 0
+    names = iter(filenames)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for filename in names:
+            pending.add(pool.submit(analyze, filename))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if 'error' in result:
+                    failed += 1
+                out.write(line_helper(result))
+                #refill the window with the next file
+                for filename in names:
+                    pending.add(pool.submit(analyze, filename))
+                    break
+            out.flush()
+    return failed
@@ -0,0 +1,8 @@
+''' benchmarks of the dependency graph and flow network datastructures on seeded
+    synthetic inputs. run the suite from the repository root with
+
+        python -m benchmarks [--size small|medium|large] [--json FILE] [--compare FILE]
+
+    generators builds the inputs, harness measures time and peak memory, suite lists
+    the benchmarks and deep_chain checks that sorting a deep chain stays linear
+'''
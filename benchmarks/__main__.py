@@ -0,0 +1,40 @@
+''' command line entry point of the benchmark suite, writes a JSON report and exits
+    with 1 if a benchmark got slower than in a baseline report
+'''
+import argparse
+import json
+import sys
+from benchmarks import harness, suite
+
+def main(argv=None):
+    ''' run the suite and return the exit status '''
+    p = argparse.ArgumentParser(prog='python -m benchmarks', description="benchmark the graph and flow datastructures")
+    p.add_argument('--size', default='small', choices=sorted(suite.SIZES))
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--repeat', type=int, default=3, help="runs per benchmark, the best time is kept")
+    p.add_argument('--filter', default='', help="only run benchmarks whose name contains this text")
+    p.add_argument('--no-memory', dest='memory', action='store_false', help="skip the traced memory run")
+    p.add_argument('--json', help="write the report to this file")
+    p.add_argument('--compare', help="baseline report to compare the times against")
+    p.add_argument('--tolerance', type=float, default=1.5, help="slowdown over the baseline counted as a regression")
+    args = p.parse_args(argv)
+    selected = [b for b in suite.benchmarks(args.size, args.seed) if args.filter in b[0]]
+    results = harness.run_all(selected, args.repeat, args.memory, sys.stdout)
+    report = harness.report(results, args.size)
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump(report, output, indent=1)
+    if args.compare:
+        with open(args.compare) as inputf:
+            baseline = json.load(inputf)
+        if baseline.get('backend') != report['backend']:
+            sys.stdout.write("note: the baseline was measured with backend %s, this run with %s\n" % (json.dumps(baseline.get('backend')), json.dumps(report['backend'])))
+        slower = harness.compare(results, baseline, args.tolerance)
+        for name, parameters, seconds, before in slower:
+            sys.stdout.write("slower: %s %s %.4f s, was %.4f s\n" % (name, json.dumps(parameters), seconds, before))
+        if slower:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
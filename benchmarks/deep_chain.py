@@ -0,0 +1,27 @@
+''' times topological sort and cycle detection on a single dependency chain of
+    growing depth, the time per vertex should stay flat if they run in linear time.
+    run from the repository root with: python -m benchmarks.deep_chain [max depth]
+'''
+import sys
+import time
+from benchmarks.generators import build_graph, chain
+
+def main(argv):
+    ''' print the time taken and time per vertex of every method at each depth '''
+    limit = int(argv[0]) if argv else 1000000
+    n = 1000
+    print("%10s %12s %10s %14s" % ("depth", "method", "seconds", "us per vertex"))
+    while n <= limit:
+        g = build_graph(chain(n))
+        for method in ['dynamic', 'dfs', 'kahn', 'is_cyclic']:
+            start = time.perf_counter()
+            if method == 'is_cyclic':
+                g.is_cyclic()
+            else:
+                g.topological_sort(method)
+            elapsed = time.perf_counter() - start
+            print("%10d %12s %10.3f %14.3f" % (g.order(), method, elapsed, elapsed * 1e6 / g.order()))
+        n *= 10
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
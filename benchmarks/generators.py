@@ -0,0 +1,131 @@
+''' seeded generators of synthetic dependency graphs and flow networks. every
+    generator returns a list of edges (dependent, dependency) or arcs (node, neighbor,
+    capacity) over integer names, the same seed always gives the same list, and
+    build_graph and build_flow turn them into a Graph or Flow
+'''
+import random
+from graph import Graph
+from flow import Flow
+
+def build_graph(edges, vertices=0):
+    ''' returns a Graph with the vertices 0..vertices-1 and the given edges '''
+    g = Graph()
+    for i in range(vertices):
+        g.add_vertex(i)
+    g.add_edges_from(edges)
+    return g
+
+def build_flow(arcs):
+    ''' returns a Flow with the given arcs '''
+    return Flow.from_arcs(arcs)
+
+def chain(n):
+    ''' vertex i depends on vertex i + 1, the deepest possible graph '''
+    return [(i, i + 1) for i in range(n)]
+
+def random_dag(n, m, seed=0):
+    ''' m random edges between n vertices, always from the higher to the lower
+        vertex so there is no cycle
+    '''
+    rng = random.Random(seed)
+    edges = {}
+    while len(edges) < m and len(edges) < n * (n - 1) // 2:
+        u = rng.randrange(n)
+        v = rng.randrange(n)
+        if u > v:
+            edges[(u, v)] = None
+        elif v > u:
+            edges[(v, u)] = None
+    return list(edges)
+
+def random_graph(n, m, seed=0):
+    ''' m random edges between n vertices in either direction, almost surely cyclic '''
+    rng = random.Random(seed)
+    edges = {}
+    while len(edges) < m and len(edges) < n * (n - 1):
+        u = rng.randrange(n)
+        v = rng.randrange(n)
+        if u != v:
+            edges[(u, v)] = None
+    return list(edges)
+
+def layered_dag(layers, width, degree, seed=0):
+    ''' layers of width vertices where every vertex depends on degree vertices of the
+        next layer, like a build graph with a fixed number of stages
+    '''
+    rng = random.Random(seed)
+    edges = []
+    for layer in range(layers - 1):
+        for i in range(width):
+            u = layer * width + i
+            for j in rng.sample(range(width), min(degree, width)):
+                edges.append((u, (layer + 1) * width + j))
+    return edges
+
+def grid_flow(rows, cols, capacity=100, seed=0):
+    ''' a rows by cols grid with arcs right and down and random capacities, flowing
+        from the top left corner to the bottom right corner
+    '''
+    rng = random.Random(seed)
+    arcs = []
+    for r in range(rows):
+        for c in range(cols):
+            u = r * cols + c
+            if c + 1 < cols:
+                arcs.append((u, u + 1, float(rng.randint(1, capacity))))
+            if r + 1 < rows:
+                arcs.append((u, u + cols, float(rng.randint(1, capacity))))
+    return arcs
+
+def bipartite_flow(left, right, degree, capacity=10, seed=0):
+    ''' a bipartite matching style network, a source feeds left nodes that each have
+        degree arcs to right nodes which drain into a sink
+    '''
+    rng = random.Random(seed)
+    source = 's'
+    sink = 't'
+    arcs = []
+    for i in range(left):
+        arcs.append((source, ('l', i), float(rng.randint(1, capacity))))
+        for j in rng.sample(range(right), min(degree, right)):
+            arcs.append((('l', i), ('r', j), float(rng.randint(1, capacity))))
+    for j in range(right):
+        arcs.append((('r', j), sink, float(rng.randint(1, capacity))))
+    return arcs
+
+def layered_flow(layers, width, degree, capacity=100, seed=0):
+    ''' layers of width nodes with degree arcs from every node to the next layer, the
+        first layer are the sources and the last the sinks
+    '''
+    rng = random.Random(seed)
+    arcs = []
+    for layer in range(layers - 1):
+        for i in range(width):
+            u = layer * width + i
+            for j in rng.sample(range(width), min(degree, width)):
+                arcs.append((u, (layer + 1) * width + j, float(rng.randint(1, capacity))))
+    return arcs
+
+def edmonds_karp_adversarial(k, length=None):
+    ''' k unit capacity chains of the same length, k by default, from a source to a
+        sink, with every node of a chain also linked to the next node of the
+        following chain. every augmenting path is as long as a chain, so a breadth
+        first search only reaches the sink after scanning nearly the whole network,
+        and algorithms that find one path per search need k of them, O(k^2 length)
+        in all, while a blocking flow saturates every chain in a single phase
+    '''
+    if length is None:
+        length = k
+    arcs = []
+    chains = []
+    for c in range(k):
+        nodes = [('c', c, i) for i in range(length)]
+        chains.append(nodes)
+        arcs.append(('s', nodes[0], 1.0))
+        for i in range(length - 1):
+            arcs.append((nodes[i], nodes[i + 1], 1.0))
+        arcs.append((nodes[-1], 't', 1.0))
+    for a, b in zip(chains, chains[1:]):
+        for i in range(length - 1):
+            arcs.append((a[i], b[i + 1], 1.0))
+    return arcs
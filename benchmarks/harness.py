@@ -0,0 +1,87 @@
+''' timing and memory harness. a benchmark is a name, a setup function that builds a
+    fresh input outside the measurement and a function that is measured on it. the
+    time is the best of several runs and the memory is the peak traced by
+    tracemalloc in a separate run, since tracing slows everything down. results
+    are plain dictionaries so they can be written as JSON and compared with an
+    earlier run
+'''
+import gc
+import importlib
+import json
+import platform
+import time
+import tracemalloc
+
+def measure(setup, run, repeat=3, memory=True):
+    ''' returns the best time in seconds of run(setup()) over repeat runs and the peak
+        number of bytes allocated by one run, None if memory is false
+    '''
+    best = None
+    for i in range(repeat):
+        data = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(data)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    peak = None
+    if memory:
+        data = setup()
+        gc.collect()
+        tracemalloc.start()
+        run(data)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak
+
+def run_all(benchmarks, repeat=3, memory=True, log=None):
+    ''' measure every (name, parameters, setup, run) benchmark and return a list of
+        result dictionaries, writing a line per benchmark to log if given
+    '''
+    results = []
+    for name, parameters, setup, run in benchmarks:
+        seconds, peak = measure(setup, run, repeat, memory)
+        result = {'benchmark': name, 'parameters': parameters, 'seconds': seconds, 'peak_bytes': peak}
+        results.append(result)
+        if log is not None:
+            log.write("%-40s %-30s %10.4f s %12s\n" % (name, json.dumps(parameters), seconds, '-' if peak is None else str(peak // 1024) + ' KiB'))
+    return results
+
+def backend():
+    ''' returns the versions of numpy and scipy, None for one that is not installed '''
+    versions = {}
+    for module in ['numpy', 'scipy']:
+        try:
+            versions[module] = importlib.import_module(module).__version__
+        except ImportError:
+            versions[module] = None
+    return versions
+
+def report(results, size):
+    ''' returns a JSON serializable report of the results with the environment they
+        were measured in, including the optional numpy and scipy backend
+    '''
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'backend': backend(),
+        'size': size,
+        'results': results,
+    }
+
+def compare(results, baseline, tolerance):
+    ''' returns the (name, parameters, seconds, baseline seconds) of every result that
+        is more than tolerance times slower than the same benchmark in the baseline
+        report
+    '''
+    before = {}
+    for result in baseline['results']:
+        before[(result['benchmark'], json.dumps(result['parameters'], sort_keys=True))] = result['seconds']
+    slower = []
+    for result in results:
+        key = (result['benchmark'], json.dumps(result['parameters'], sort_keys=True))
+        if key in before and result['seconds'] > before[key] * tolerance:
+            slower.append((result['benchmark'], result['parameters'], result['seconds'], before[key]))
+    return slower
@@ -0,0 +1,98 @@
+''' the benchmarks of Graph and Flow at three sizes. small runs in seconds and is
+    meant for every change, medium and large approach production inputs
+'''
+from benchmarks import generators
+from graph import Graph
+import accel
+
+SIZES = {
+    'small': {'n': 2000, 'degree': 4, 'chain': 10000, 'grid': 30, 'bipartite': 300, 'layers': 10, 'width': 50, 'adversarial': 80},
+    'medium': {'n': 20000, 'degree': 4, 'chain': 100000, 'grid': 80, 'bipartite': 2000, 'layers': 20, 'width': 200, 'adversarial': 150},
+    'large': {'n': 200000, 'degree': 4, 'chain': 1000000, 'grid': 200, 'bipartite': 10000, 'layers': 40, 'width': 500, 'adversarial': 300},
+}
+
+ALGORITHMS = ['dinic', 'push_relabel', 'edmonds_karp']
+
+def graph_benchmarks(size, seed):
+    ''' benchmarks of building, editing, sorting and checking dependency graphs '''
+    n = size['n']
+    m = n * size['degree']
+    inputs = [
+        ('random_dag', {'n': n, 'm': m, 'seed': seed}, lambda: generators.random_dag(n, m, seed)),
+        ('layered_dag', {'layers': size['layers'], 'width': size['width'], 'seed': seed},
+            lambda: generators.layered_dag(size['layers'], size['width'], size['degree'], seed)),
+        ('chain', {'n': size['chain']}, lambda: generators.chain(size['chain'])),
+        ('random_graph', {'n': n, 'm': m, 'seed': seed}, lambda: generators.random_graph(n, m, seed)),
+    ]
+    benchmarks = []
+    for name, parameters, edges in inputs:
+        edges = edges()
+        benchmarks.append(('graph.add_edge/' + name, parameters,
+            lambda edges=edges: edges, add_each))
+        benchmarks.append(('graph.from_edges/' + name, parameters,
+            lambda edges=edges: edges, Graph.from_edges))
+        benchmarks.append(('graph.remove_vertex/' + name, parameters,
+            lambda edges=edges: generators.build_graph(edges), remove_tenth))
+        for method in ['dynamic', 'dfs', 'kahn']:
+            benchmarks.append(('graph.topological_sort.' + method + '/' + name, parameters,
+                lambda edges=edges: generators.build_graph(edges), lambda g, method=method: g.topological_sort(method)))
+        benchmarks.append(('graph.is_cyclic/' + name, parameters,
+            lambda edges=edges: generators.build_graph(edges), lambda g: g.is_cyclic()))
+    return benchmarks
+
+def add_each(edges):
+    ''' build a graph one add_edge call at a time '''
+    g = Graph()
+    for vertex, neighbor in edges:
+        g.add_edge(vertex, neighbor)
+    return g
+
+def remove_tenth(g):
+    ''' remove every tenth vertex of a graph '''
+    for vertex in list(g.vertices())[::10]:
+        g.remove_vertex(vertex)
+
+def flow_benchmarks(size, seed):
+    ''' benchmarks of every pure python max flow algorithm on snapshots of the flow
+        network families, and of scipy on its own when it is installed
+    '''
+    inputs = [
+        ('grid', {'rows': size['grid'], 'cols': size['grid'], 'seed': seed},
+            lambda: generators.grid_flow(size['grid'], size['grid'], seed=seed)),
+        ('bipartite', {'left': size['bipartite'], 'right': size['bipartite'], 'seed': seed},
+            lambda: generators.bipartite_flow(size['bipartite'], size['bipartite'], size['degree'], seed=seed)),
+        ('layered', {'layers': size['layers'], 'width': size['width'], 'seed': seed},
+            lambda: generators.layered_flow(size['layers'], size['width'], size['degree'], seed=seed)),
+        ('edmonds_karp_adversarial', {'k': size['adversarial']},
+            lambda: generators.edmonds_karp_adversarial(size['adversarial'])),
+    ]
+    benchmarks = []
+    #import scipy before anything is measured, it is only timed on its own entries
+    accel.load_helper()
+    for name, parameters, arcs in inputs:
+        arcs = arcs()
+        for algorithm in ALGORITHMS:
+            benchmarks.append(('flow.solve.' + algorithm + '/' + name, parameters,
+                lambda arcs=arcs: generators.build_flow(arcs).csr(), lambda network, algorithm=algorithm: pure_solve(network, algorithm)))
+        if accel.available:
+            benchmarks.append(('flow.solve.scipy/' + name, parameters,
+                lambda arcs=arcs: generators.build_flow(arcs).csr(), scipy_solve))
+    return benchmarks
+
+def pure_solve(network, algorithm):
+    ''' solve a snapshot with the pure python algorithm even when scipy is installed '''
+    available = accel.available
+    accel.available = False
+    try:
+        return network.solve(algorithm)
+    finally:
+        accel.available = available
+
+def scipy_solve(network):
+    ''' solve a snapshot with scipy whatever its size '''
+    sources, sinks = network.flow_terminals_helper(None, None)
+    return accel.solve(network, sources, sinks)
+
+def benchmarks(size='small', seed=0):
+    ''' returns every benchmark for one of the sizes '''
+    return graph_benchmarks(SIZES[size], seed) + flow_benchmarks(SIZES[size], seed)
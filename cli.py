@@ -0,0 +1,194 @@
+''' headless command line interface to the graph and flow network analyses, e.g.
+
+        gmath toposort FILE
+        gmath cycles FILE
+        gmath levels FILE
+        gmath maxflow FILE --source s --sink t
+        gmath cuttree FILE
+        gmath batch FILE...
+        gmath convert FILE OUTPUT
+
+    files can be edge lists, binary csr files or pickles from older versions. binary
+    files are mapped and queried in place by toposort, levels and maxflow instead of
+    being loaded into a Graph or Flow. only the datastructures are imported, never
+    tkinter
+'''
+import argparse
+import sys
+import edgelist
+import csrfile
+import batch
+from stats import Stats
+
+def snapshot_helper(filename):
+    ''' returns the CSR snapshot mapped from a binary file, None for other files '''
+    if csrfile.is_csr_file(filename):
+        return csrfile.open_csr(filename)
+    return None
+
+def toposort(args, out):
+    ''' print a topological sort of a dependency graph, one vertex per line. a binary
+        file is sorted in place by a depth first search whatever the method
+    '''
+    stats = Stats() if args.stats else None
+    network = snapshot_helper(args.file)
+    if network is not None:
+        if network.is_cyclic():
+            sys.stderr.write("gmath: " + args.file + " contains a cycle\n")
+            return 1
+        if stats is not None:
+            start = stats.clock()
+        order = network.topological_sort()
+        if stats is not None:
+            stats.record('topological_sort.csr', start, vertices_visited=len(order), edges_scanned=network.size())
+    else:
+        graph = edgelist.load_graph(args.file)
+        if graph.cycle_detected():
+            sys.stderr.write("gmath: " + args.file + " contains a cycle\n")
+            return 1
+        order = graph.topological_sort(args.method, stats)
+    for vertex in order:
+        out.write(str(vertex) + '\n')
+    if stats is not None:
+        sys.stderr.write(str(stats) + '\n')
+    return 0
+
+def cycles(args, out):
+    ''' print the edges that close a cycle, exits with 1 if there are any '''
+    graph = edgelist.load_graph(args.file)
+    cyclic = graph.cycle_detected()
+    for vertex, neighbor in graph.cycle_edges:
+        out.write(str(vertex) + '\t' + str(neighbor) + '\n')
+    if cyclic:
+        return 1
+    return 0
+
+def levels(args, out):
+    ''' print the dependency waves of a dependency graph, one tab separated wave per line '''
+    network = snapshot_helper(args.file)
+    if network is None:
+        network = edgelist.load_graph(args.file)
+    for wave in network.levels():
+        out.write('\t'.join([str(v) for v in wave]) + '\n')
+    return 0
+
+def maxflow(args, out):
+    ''' print the maximum flow through a flow network, followed by the arcs of a
+        minimum cut with --cut, the flow on every arc with --flows and the flow
+        split into paths with --paths
+    '''
+    network = snapshot_helper(args.file)
+    if network is not None:
+        if network.capacities is None:
+            raise ValueError(args.file + " holds a dependency graph, not a flow network")
+        sources, sinks = args.source, args.sink
+    else:
+        flow = edgelist.load_flow(args.file)
+        sources, sinks = flow.terminals_helper(args.source, args.sink)
+        network = flow.csr()
+    for node in (args.source or []) + (args.sink or []):
+        if node not in network:
+            sys.stderr.write("gmath: no node " + node + " in " + args.file + "\n")
+            return 2
+    stats = Stats() if args.stats else None
+    result = network.solve(args.algorithm, sources, sinks, stats)
+    if stats is not None:
+        sys.stderr.write(str(stats) + '\n')
+    if result is False:
+        sys.stderr.write("gmath: " + args.file + " has no source and sink to flow between\n")
+        return 1
+    out.write(str(result.value) + '\n')
+    if args.cut:
+        for node, neighbor, capacity in result.cut_arcs():
+            out.write(str(node) + '\t' + str(neighbor) + '\t' + str(capacity) + '\n')
+    if args.flows:
+        for node, neighbor, amount in result.arc_flows():
+            out.write(str(node) + '\t' + str(neighbor) + '\t' + str(amount) + '\n')
+    if args.paths:
+        for path, amount in result.paths():
+            out.write(str(amount) + '\t' + '\t'.join([str(n) for n in path]) + '\n')
+    return 0
+
+def cuttree(args, out):
+    ''' print the Gomory-Hu tree of a flow network with its arcs made undirected, one
+        tab separated "node parent weight" edge per line
+    '''
+    flow = edgelist.load_flow(args.file)
+    for node, parent, weight in flow.gomory_hu().edges():
+        out.write(str(node) + '\t' + str(parent) + '\t' + str(weight) + '\n')
+    return 0
+
+def convert(args, out):
+    ''' write a dependency graph or flow network in the format named by the output
+        file: binary for .csr, DIMACS for a flow network ending in .max, otherwise
+        an edge or arc list
+    '''
+    if batch.is_flow_file(args.file):
+        edgelist.save_flow(edgelist.load_flow(args.file), args.output)
+    else:
+        edgelist.save_graph(edgelist.load_graph(args.file), args.output)
+    return 0
+
+def batch_files(args, out):
+    ''' analyze many files on a process pool, one JSON line per file in the order they
+        finish. file names are read from standard input when none are given. exits
+        with 1 if any file could not be analyzed
+    '''
+    filenames = args.files
+    if not filenames:
+        filenames = (line.strip() for line in sys.stdin if line.strip())
+    if batch.run(filenames, out, args.jobs):
+        return 1
+    return 0
+
+def parser():
+    ''' build the argument parser for every command '''
+    p = argparse.ArgumentParser(prog='gmath', description="analyze dependency graphs and flow networks")
+    commands = p.add_subparsers(dest='command', required=True)
+    c = commands.add_parser('toposort', help="order of resolution of dependencies")
+    c.add_argument('file')
+    c.add_argument('--method', default='dynamic', choices=['dynamic', 'dfs', 'kahn'], help="ignored for binary files, which are sorted in place")
+    c.add_argument('--stats', action='store_true', help="print the time and counters of the sort to standard error")
+    c.set_defaults(run=toposort)
+    c = commands.add_parser('cycles', help="edges that close a cycle")
+    c.add_argument('file')
+    c.set_defaults(run=cycles)
+    c = commands.add_parser('levels', help="dependency waves that can be resolved concurrently")
+    c.add_argument('file')
+    c.set_defaults(run=levels)
+    c = commands.add_parser('maxflow', help="maximum flow through a flow network")
+    c.add_argument('file')
+    c.add_argument('--source', action='append', help="source node, may be repeated, defaults to every source")
+    c.add_argument('--sink', action='append', help="sink node, may be repeated, defaults to every sink")
+    c.add_argument('--algorithm', default='dinic', choices=['dinic', 'push_relabel', 'edmonds_karp'])
+    c.add_argument('--cut', action='store_true', help="also print the arcs of a minimum cut")
+    c.add_argument('--flows', action='store_true', help="also print the flow on every arc")
+    c.add_argument('--paths', action='store_true', help="also print the flow split into source to sink paths")
+    c.add_argument('--stats', action='store_true', help="print the time and counters of every phase to standard error")
+    c.set_defaults(run=maxflow)
+    c = commands.add_parser('cuttree', help="minimum cuts between every pair of nodes of the undirected network")
+    c.add_argument('file')
+    c.set_defaults(run=cuttree)
+    c = commands.add_parser('batch', help="analyze many files in parallel, printing JSON lines")
+    c.add_argument('files', nargs='*', help="files to analyze, read from standard input if none are given")
+    c.add_argument('--jobs', type=int, default=None, help="number of worker processes, defaults to the number of cores")
+    c.set_defaults(run=batch_files)
+    c = commands.add_parser('convert', help="write a file as an edge list, DIMACS or binary csr file")
+    c.add_argument('file')
+    c.add_argument('output', help="output file, binary if it ends in .csr and DIMACS if a flow network ends in .max")
+    c.set_defaults(run=convert)
+    return p
+
+def main(argv=None, out=None):
+    ''' run a command and return its exit status '''
+    args = parser().parse_args(argv)
+    if out is None:
+        out = sys.stdout
+    try:
+        return args.run(args, out)
+    except (OSError, ValueError) as error:
+        sys.stderr.write("gmath: " + str(error) + "\n")
+        return 2
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,411 @@
+from array import array
+import maxflow
+import accel
+from flowresult import FlowResult
+from gomoryhu import GomoryHu
+
+class CSR(object):
+    ''' immutable compressed sparse row snapshot of a graph or flow network. names are
+        interned to the integers 0..n-1 and the arcs out of vertex i are the entries
+        offsets[i] to offsets[i+1] of the targets array, with a parallel capacities
+        array for flow networks. the traversals are iterative, so they are safe on
+        arbitrarily deep graphs
+    '''
+
+    def __init__(self, names, offsets, targets, capacities=None, indegrees=None, terminals=None):
+        ''' create a snapshot from a name table and the offset, target and optional
+            capacity and indegree arrays, use from_graph or from_flow to build one.
+            any indexable sequence works for the names and arrays, which lets a file
+            backed snapshot decode names and read arrays only when they are used.
+            terminals is the pair of lists of source and sink ids a flow network
+            flows between by default, None for its nodes without incoming or
+            outgoing arcs
+        '''
+        if isinstance(names, list):
+            names = tuple(names)
+        if indegrees is None:
+            indegrees = array('q', bytes(8 * len(names)))
+            for v in targets:
+                indegrees[v] += 1
+        object.__setattr__(self, 'names', names)
+        object.__setattr__(self, 'offsets', offsets)
+        object.__setattr__(self, 'targets', targets)
+        object.__setattr__(self, 'capacities', capacities)
+        object.__setattr__(self, 'indegrees', indegrees)
+        object.__setattr__(self, 'terminals', terminals)
+        object.__setattr__(self, 'lookup', None)
+
+    @classmethod
+    def from_graph(cls, graph):
+        ''' snapshot a dependency graph, the edge (a,b) means "a depends on b" '''
+        names = list(graph.vertices())
+        index = {}
+        for i in range(len(names)):
+            index[names[i]] = i
+        offsets = array('q', [0])
+        targets = array('q')
+        for name in names:
+            for neighbor in graph.get_vertex(name).neighbors():
+                targets.append(index[neighbor])
+            offsets.append(len(targets))
+        return cls(names, offsets, targets)
+
+    @classmethod
+    def from_flow(cls, flow):
+        ''' snapshot a flow network, keeping the capacity of every arc and its stored
+            terminals
+        '''
+        names = list(flow.nodes())
+        index = {}
+        for i in range(len(names)):
+            index[names[i]] = i
+        offsets = array('q', [0])
+        targets = array('q')
+        capacities = array('d')
+        for name in names:
+            node = flow.get_node(name)
+            for neighbor in node.neighbors():
+                targets.append(index[neighbor])
+                capacities.append(node.arc_capacity(neighbor))
+            offsets.append(len(targets))
+        terminals = None
+        if flow.terminals is not None:
+            terminals = ([index[node] for node in flow.terminals[0]], [index[node] for node in flow.terminals[1]])
+        return cls(names, offsets, targets, capacities, terminals=terminals)
+
+    def __setattr__(self, name, value):
+        ''' snapshots are frozen once built '''
+        raise AttributeError("CSR snapshots are immutable")
+
+    def index(self, vertex):
+        ''' returns the integer id of a vertex name, None if it is not in the snapshot.
+            the name table is only read into a dictionary on the first lookup
+        '''
+        if self.lookup is None:
+            lookup = {}
+            i = 0
+            for name in self.names:
+                lookup[name] = i
+                i += 1
+            object.__setattr__(self, 'lookup', lookup)
+        return self.lookup.get(vertex)
+
+    def order(self):
+        ''' return the number of vertices '''
+        return len(self.names)
+
+    def size(self):
+        ''' return the number of arcs '''
+        return len(self.targets)
+
+    def vertices(self):
+        ''' return the vertex names in index order '''
+        return list(self.names)
+
+    def nodes(self):
+        ''' return the node names in index order '''
+        return list(self.names)
+
+    def neighbors(self, i):
+        ''' return the indices vertex i is adjacent to '''
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def edges(self):
+        ''' return the edges as (vertex, neighbor) name pairs '''
+        edge_list = []
+        for i in range(len(self.names)):
+            for j in range(self.offsets[i], self.offsets[i + 1]):
+                edge_list.append((self.names[i], self.names[self.targets[j]]))
+        return edge_list
+
+    def arcs(self):
+        ''' return the arcs as (node, neighbor, capacity) tuples '''
+        arc_list = []
+        for i in range(len(self.names)):
+            for j in range(self.offsets[i], self.offsets[i + 1]):
+                arc_list.append((self.names[i], self.names[self.targets[j]], self.capacities[j]))
+        return arc_list
+
+    def indegree(self, vertex):
+        ''' returns the indegree of a vertex by name '''
+        i = self.index(vertex)
+        if i is not None:
+            return self.indegrees[i]
+
+    def roots(self):
+        ''' returns vertices that no other vertex is adjacent to '''
+        return [self.names[i] for i in range(len(self.names)) if self.indegrees[i] == 0]
+
+    def sources(self):
+        ''' returns all the sources in the flow network '''
+        return self.roots()
+
+    def sinks(self):
+        ''' returns all the nodes without outgoing arcs '''
+        offsets = self.offsets
+        return [self.names[i] for i in range(len(self.names)) if offsets[i] == offsets[i + 1]]
+
+    def is_cyclic(self):
+        ''' iterative depth first search with three colors, a back-edge to a gray
+            vertex on the stack means there is a cycle. large snapshots use the
+            vectorized backend when it is installed
+        '''
+        if accel.use(self):
+            return accel.is_cyclic(self)
+        offsets = self.offsets
+        targets = self.targets
+        #0 is white, 1 is gray, 2 is black
+        color = bytearray(len(self.names))
+        position = array('q', offsets[:-1])
+        for root in range(len(self.names)):
+            if color[root]:
+                continue
+            color[root] = 1
+            stack = [root]
+            while stack:
+                u = stack[-1]
+                if position[u] < offsets[u + 1]:
+                    v = targets[position[u]]
+                    position[u] += 1
+                    if color[v] == 1:
+                        return True
+                    if color[v] == 0:
+                        color[v] = 1
+                        stack.append(v)
+                else:
+                    color[u] = 2
+                    stack.pop()
+        return False
+
+    def topological_sort(self):
+        ''' iterative depth first search giving the same order of resolution of
+            dependencies as Graph.topological_sort(method='dfs'), dependencies come
+            first. large acyclic snapshots are ordered wave by wave by the vectorized
+            backend when it is installed, which is another valid order
+        '''
+        if accel.use(self):
+            order = accel.topological_sort(self)
+            if order is not None:
+                return [self.names[i] for i in order]
+        offsets = self.offsets
+        targets = self.targets
+        visited = bytearray(len(self.names))
+        position = array('q', offsets[:-1])
+        order = []
+        for root in range(len(self.names)):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            stack = [root]
+            while stack:
+                u = stack[-1]
+                if position[u] < offsets[u + 1]:
+                    v = targets[position[u]]
+                    position[u] += 1
+                    if not visited[v]:
+                        visited[v] = 1
+                        stack.append(v)
+                else:
+                    order.append(self.names[u])
+                    stack.pop()
+        return order
+
+    def levels(self):
+        ''' returns the dependency waves as a list of lists of names, the same waves as
+            Graph.levels with each wave in index order
+        '''
+        if accel.use(self):
+            return [[self.names[i] for i in wave.tolist()] for wave in accel.levels(self)]
+        offsets = self.offsets
+        targets = self.targets
+        n = len(self.names)
+        dependents = [[] for i in range(n)]
+        remaining = array('q', bytes(8 * n))
+        for u in range(n):
+            remaining[u] = offsets[u + 1] - offsets[u]
+            for j in range(offsets[u], offsets[u + 1]):
+                dependents[targets[j]].append(u)
+        wave = [u for u in range(n) if remaining[u] == 0]
+        waves = []
+        while wave:
+            waves.append(wave)
+            next_wave = []
+            for v in wave:
+                for u in dependents[v]:
+                    remaining[u] -= 1
+                    if remaining[u] == 0:
+                        next_wave.append(u)
+            wave = sorted(next_wave)
+        return [[self.names[i] for i in wave] for wave in waves]
+
+    def reachable(self, vertices):
+        ''' returns the names of every vertex reachable from the given ones, including
+            them, in index order. for a dependency graph these are everything the given
+            vertices depend on
+        '''
+        starts = self.terminals_helper(vertices)
+        if accel.use(self):
+            return [self.names[i] for i in accel.reachable(self, starts)]
+        offsets = self.offsets
+        targets = self.targets
+        seen = bytearray(len(self.names))
+        for i in starts:
+            seen[i] = 1
+        stack = list(starts)
+        while stack:
+            u = stack.pop()
+            for j in range(offsets[u], offsets[u + 1]):
+                if not seen[targets[j]]:
+                    seen[targets[j]] = 1
+                    stack.append(targets[j])
+        return [self.names[i] for i in range(len(self.names)) if seen[i]]
+
+    def max_flow(self, algorithm='dinic', sources=None, sinks=None, stats=None, cancel=None):
+        ''' returns max flow through the flow network using 'dinic', 'push_relabel' or
+            'edmonds_karp', False if there is no source and sink to flow between. the
+            sources and sinks default to every node without incoming or outgoing arcs.
+            the phases are recorded in stats if given, and the pure python algorithms
+            raise maxflow.Cancelled once cancel is set
+        '''
+        result = self.solve(algorithm, sources, sinks, stats, cancel)
+        if result is False:
+            return False
+        return result.value
+
+    def solve(self, algorithm='dinic', sources=None, sinks=None, stats=None, cancel=None):
+        ''' computes the max flow like max_flow and returns a FlowResult with its value,
+            the flow on every arc and a minimum cut, all read off the final residual
+            network in one extra pass. False if there is no source and sink. large
+            networks with integer capacities are handed to scipy for 'dinic' when it
+            is installed, which cannot be cancelled once it runs
+        '''
+        terminals = self.flow_terminals_helper(sources, sinks)
+        if terminals is False:
+            return False
+        sources, sinks = terminals
+        if algorithm == 'dinic' and accel.use(self):
+            maxflow.cancel_helper(cancel)
+            if stats is not None:
+                start = stats.clock()
+            solved = accel.solve(self, sources, sinks)
+            if solved is not None:
+                if stats is not None:
+                    stats.record('scipy', start)
+                value, flows, side = solved
+                return FlowResult(self, value, flows, side, sources, sinks)
+        solve = self.algorithm_helper(algorithm)
+        if stats is not None:
+            start = stats.clock()
+        res, s, t = maxflow.residual(len(self.names), self.arc_indices(), sources, sinks)
+        if stats is not None:
+            stats.record('residual', start, arcs_added=len(res.to) // 2)
+        value = solve(res, s, t, stats=stats, cancel=cancel)
+        if stats is not None:
+            start = stats.clock()
+        #arc k of the snapshot is residual arc 2k, the flow on it is what its reverse
+        #arc can send back
+        flows = array('d', [res.cap[2 * k + 1] for k in range(len(self.targets))])
+        reaches = maxflow.sink_side(res, t)
+        side = bytearray(len(self.names))
+        for i in range(len(self.names)):
+            side[i] = not reaches[i]
+        #the super source and sink arcs are bounded by the node's own capacity, so a
+        #terminal on the wrong side can always be moved over without growing the cut
+        for i in sources:
+            side[i] = True
+        for i in sinks:
+            side[i] = False
+        if stats is not None:
+            stats.record('min_cut', start)
+        return FlowResult(self, value, flows, side, sources, sinks)
+
+    def max_flows(self, pairs, algorithm='dinic'):
+        ''' returns the list of max flows between many (source, sink) pairs of node
+            names. one residual network of the arcs is built and its capacities are
+            reset between the pairs, which need no super source or sink
+        '''
+        solve = self.algorithm_helper(algorithm)
+        res = maxflow.Residual(len(self.names))
+        for u, v, capacity in self.arc_indices():
+            res.add_arc(u, v, capacity)
+        base = list(res.cap)
+        values = []
+        for source, sink in pairs:
+            s, t = self.terminals_helper([source, sink])
+            if s == t:
+                raise ValueError("a node cannot be both a source and a sink")
+            res.cap[:] = base
+            values.append(solve(res, s, t))
+        return values
+
+    def gomory_hu(self):
+        ''' returns the Gomory-Hu tree of the network with every arc made undirected,
+            antiparallel arcs adding up. it answers the minimum cut between any two
+            nodes of that undirected network after only n - 1 max flows, for directed
+            max flows between many pairs use max_flows
+        '''
+        edges = [(u, v, capacity) for u, v, capacity in self.arc_indices() if u != v]
+        parent, weight = maxflow.gomory_hu(len(self.names), edges)
+        return GomoryHu(self.names, parent, weight)
+
+    def algorithm_helper(self, algorithm):
+        ''' returns the max flow function for an algorithm name '''
+        if algorithm == 'dinic':
+            return maxflow.dinic
+        elif algorithm == 'push_relabel':
+            return maxflow.push_relabel
+        elif algorithm == 'edmonds_karp':
+            return maxflow.edmonds_karp
+        raise ValueError("unknown max flow algorithm: " + str(algorithm))
+
+    def flow_terminals_helper(self, sources, sinks):
+        ''' returns the source and sink ids to compute a max flow between, False if
+            there is no source and sink. the sides that are not given come from the
+            stored terminals if there are any
+        '''
+        if sources is None and self.terminals is not None:
+            sources = list(self.terminals[0])
+        elif sources is None:
+            sources = [i for i in range(len(self.names)) if self.indegrees[i] == 0]
+        else:
+            sources = self.terminals_helper(sources)
+        if sinks is None and self.terminals is not None:
+            sinks = list(self.terminals[1])
+            if set(sources) & set(sinks):
+                raise ValueError("a node cannot be both a source and a sink")
+        elif sinks is None:
+            sinks = [i for i in range(len(self.names)) if self.offsets[i] == self.offsets[i + 1]]
+        else:
+            sinks = self.terminals_helper(sinks)
+            if set(sources) & set(sinks):
+                raise ValueError("a node cannot be both a source and a sink")
+        if not (sources and sinks) or len(self.names) < 2:
+            return False
+        return sources, sinks
+
+    def terminals_helper(self, names):
+        ''' returns the integer ids of a list of node names '''
+        ids = []
+        for name in names:
+            i = self.index(name)
+            if i is None:
+                raise ValueError("no node named " + str(name))
+            ids.append(i)
+        return ids
+
+    def arc_indices(self):
+        ''' generator of the arcs as (node index, neighbor index, capacity) '''
+        offsets = self.offsets
+        targets = self.targets
+        capacities = self.capacities
+        for i in range(len(self.names)):
+            for j in range(offsets[i], offsets[i + 1]):
+                yield i, targets[j], capacities[j]
+
+    def __len__(self):
+        ''' number of vertices in the snapshot '''
+        return len(self.names)
+
+    def __contains__(self, vertex):
+        ''' contains method for the snapshot '''
+        return self.index(vertex) is not None
@@ -0,0 +1,150 @@
+''' versioned binary file format for CSR snapshots of dependency graphs and flow
+    networks. the file is a fixed header followed by the name offsets, vertex offsets,
+    indegrees, targets and, for flow networks, capacities as 8 byte native integers
+    and floats, then for a flow network with stored terminals the numbers of sources
+    and sinks and their ids, and finally the utf-8 name table. opening a file maps it into memory
+    and hands the arrays straight to the snapshot, so nothing is read until a query
+    touches it and processes opening the same file share it through the page cache
+'''
+import mmap
+import struct
+import sys
+from array import array
+from csr import CSR
+from graph import Graph
+from flow import Flow
+
+MAGIC = b'GMATHCSR'
+#version 2 added the terminals section, version 1 files are still read
+VERSION = 2
+#magic, version, flags, vertex count, arc count, name table length
+HEADER = struct.Struct('<8sIIQQQ')
+FLAG_CAPACITIES = 1
+FLAG_BIG_ENDIAN = 2
+FLAG_TERMINALS = 4
+
+class NameTable(object):
+    ''' read only sequence of names decoded from a utf-8 blob on demand '''
+
+    def __init__(self, offsets, blob):
+        ''' offsets[i] to offsets[i+1] is the span of name i in the blob '''
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        ''' number of names in the table '''
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        ''' decode name i '''
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("name index out of range")
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+    def __iter__(self):
+        ''' decode the names in order '''
+        for i in range(len(self)):
+            yield self[i]
+
+def is_csr_file(filename):
+    ''' returns true if the file starts with the binary format's magic bytes '''
+    with open(filename, 'rb') as inputf:
+        return inputf.read(len(MAGIC)) == MAGIC
+
+def save(network, filename):
+    ''' write a Graph, Flow or CSR snapshot to a binary file, names are written as
+        their str()
+    '''
+    if not isinstance(network, CSR):
+        network = network.csr()
+    blob = bytearray()
+    name_offsets = array('q', [0])
+    for name in network.names:
+        blob += str(name).encode('utf-8')
+        name_offsets.append(len(blob))
+    flags = 0
+    if network.capacities is not None:
+        flags |= FLAG_CAPACITIES
+    if sys.byteorder == 'big':
+        flags |= FLAG_BIG_ENDIAN
+    if network.terminals is not None:
+        flags |= FLAG_TERMINALS
+    with open(filename, 'wb') as output:
+        output.write(HEADER.pack(MAGIC, VERSION, flags, len(network.names), len(network.targets), len(blob)))
+        output.write(name_offsets.tobytes())
+        output.write(array('q', network.offsets).tobytes())
+        output.write(array('q', network.indegrees).tobytes())
+        output.write(array('q', network.targets).tobytes())
+        if network.capacities is not None:
+            output.write(array('d', network.capacities).tobytes())
+        if network.terminals is not None:
+            sources, sinks = network.terminals
+            output.write(array('q', [len(sources), len(sinks)] + list(sources) + list(sinks)).tobytes())
+        output.write(bytes(blob))
+
+def open_csr(filename):
+    ''' map a binary file into memory and return a CSR snapshot backed by it '''
+    with open(filename, 'rb') as inputf:
+        data = mmap.mmap(inputf.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(data) < HEADER.size:
+        raise ValueError(filename + " is not a gmath binary graph file")
+    magic, version, flags, n, m, names = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(filename + " is not a gmath binary graph file")
+    if version not in (1, VERSION):
+        raise ValueError(filename + " has unsupported format version " + str(version))
+    if bool(flags & FLAG_BIG_ENDIAN) != (sys.byteorder == 'big'):
+        raise ValueError(filename + " was written on a machine with the other byte order")
+    view = memoryview(data)
+    position = HEADER.size
+    sections = []
+    for count, code in [(n + 1, 'q'), (n + 1, 'q'), (n, 'q'), (m, 'q')] + ([(m, 'd')] if flags & FLAG_CAPACITIES else []):
+        sections.append(view[position:position + 8 * count].cast(code))
+        position += 8 * count
+    terminals = None
+    if flags & FLAG_TERMINALS:
+        if position + 16 > len(data):
+            raise ValueError(filename + " is truncated or corrupt")
+        counts = view[position:position + 16].cast('q')
+        ids = view[position + 16:position + 16 + 8 * (counts[0] + counts[1])].cast('q')
+        terminals = (ids[:counts[0]].tolist(), ids[counts[0]:].tolist())
+        position += 16 + 8 * (counts[0] + counts[1])
+    if position + names != len(data):
+        raise ValueError(filename + " is truncated or corrupt")
+    table = NameTable(sections[0], view[position:position + names])
+    capacities = sections[4] if flags & FLAG_CAPACITIES else None
+    return CSR(table, sections[1], sections[3], capacities, sections[2], terminals)
+
+def load_graph(filename):
+    ''' open a binary file and build a dependency graph from it '''
+    network = open_csr(filename)
+    graph = Graph()
+    names = list(network.names)
+    for name in names:
+        graph.add_vertex(name)
+    graph.add_edges_from(edges_helper(network, names))
+    return graph
+
+def edges_helper(network, names):
+    ''' generator of the edges of a snapshot as name pairs, reading the arrays in place '''
+    offsets = network.offsets
+    targets = network.targets
+    for i in range(len(names)):
+        for k in range(offsets[i], offsets[i + 1]):
+            yield names[i], names[targets[k]]
+
+def load_flow(filename):
+    ''' open a binary file and build a flow network from it '''
+    network = open_csr(filename)
+    if network.capacities is None:
+        raise ValueError(filename + " holds a dependency graph, not a flow network")
+    flow = Flow()
+    names = list(network.names)
+    for name in names:
+        flow.add_node(name)
+    flow.add_arcs_from((names[i], names[j], capacity) for i, j, capacity in network.arc_indices())
+    if network.terminals is not None:
+        flow.set_terminals([names[i] for i in network.terminals[0]], [names[i] for i in network.terminals[1]])
+    return flow
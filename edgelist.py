@@ -0,0 +1,276 @@
+''' line oriented text formats for dependency graphs and flow networks. a dependency
+    graph is one edge per line, "dependent dependency", and a flow network is one arc
+    per line, "node neighbor capacity". a line with a single name adds a vertex or
+    node without edges and lines starting with # are comments. fields are separated
+    by tabs when the line has one, otherwise by whitespace, and the writers always use
+    tabs so names may contain spaces. flow networks can also be read and written in
+    the DIMACS max flow format. the readers consume any iterable of lines in a single
+    pass and the writers stream from generators without building edge or arc lists
+'''
+import pickle
+from graph import Graph
+from flow import Flow
+import csrfile
+
+def fields_helper(line):
+    ''' split a line into its fields, None for blank lines and comments '''
+    line = line.rstrip('\r\n')
+    if not line.strip() or line.lstrip().startswith('#'):
+        return None
+    if '\t' in line:
+        fields = line.split('\t')
+        #a lone name containing spaces is written with a trailing tab
+        if fields[-1] == '':
+            fields.pop()
+        return fields
+    return line.split()
+
+def lone_helper(name):
+    ''' returns the line for a vertex or node without edges '''
+    if len(name.split()) != 1:
+        return name + '\t\n'
+    return name + '\n'
+
+def name_helper(name):
+    ''' returns a vertex name as text that can be written into a field '''
+    name = str(name)
+    if not name or '\t' in name or '\n' in name or '\r' in name:
+        raise ValueError("name cannot be written to an edge list: " + repr(name))
+    return name
+
+def field_helper(name):
+    ''' returns a vertex name as text for an edge list field, a name that starts with
+        # would be read back as a comment
+    '''
+    name = name_helper(name)
+    if name.lstrip().startswith('#'):
+        raise ValueError("name cannot be written to an edge list: " + repr(name))
+    return name
+
+def read_graph(lines, graph=None):
+    ''' read a dependency graph from an iterable of lines, adding to graph if given '''
+    if graph is None:
+        graph = Graph()
+    graph.add_edges_from(graph_edges_helper(lines, graph))
+    return graph
+
+def graph_edges_helper(lines, graph):
+    ''' generator of the edges of an edge list for add_edges_from, lone vertices are
+        added to graph as they are read so the file order is kept
+    '''
+    for number, line in enumerate(lines, 1):
+        fields = fields_helper(line)
+        if fields is None:
+            continue
+        if len(fields) == 1:
+            graph.add_vertex(fields[0])
+        elif len(fields) == 2:
+            yield fields[0], fields[1]
+        else:
+            raise ValueError("line " + str(number) + ": expected 'dependent dependency'")
+
+def graph_lines(graph):
+    ''' generator of the lines of a dependency graph, vertices without any edges are
+        written on their own
+    '''
+    for vertex in graph.graph_dict:
+        v = graph.get_vertex(vertex)
+        name = field_helper(vertex)
+        if v.outdegree() == 0 and v.indegree() == 0:
+            yield lone_helper(name)
+        for neighbor in v.neighbors():
+            yield name + '\t' + field_helper(neighbor) + '\n'
+
+def write_graph(graph, output):
+    ''' write a dependency graph to a text file object '''
+    output.writelines(graph_lines(graph))
+
+def read_flow(lines, flow=None):
+    ''' read a flow network from an iterable of lines, adding to flow if given '''
+    if flow is None:
+        flow = Flow()
+    flow.add_arcs_from(flow_arcs_helper(lines, flow))
+    return flow
+
+def flow_arcs_helper(lines, flow):
+    ''' generator of the arcs of an edge list for add_arcs_from, lone nodes are added
+        to flow as they are read so the file order is kept
+    '''
+    for number, line in enumerate(lines, 1):
+        fields = fields_helper(line)
+        if fields is None:
+            continue
+        if len(fields) == 1:
+            flow.add_node(fields[0])
+        elif len(fields) == 3:
+            yield fields[0], fields[1], float(fields[2])
+        else:
+            raise ValueError("line " + str(number) + ": expected 'node neighbor capacity'")
+
+def flow_lines(flow):
+    ''' generator of the lines of a flow network, nodes without any arcs are written
+        on their own. an arc list has no place for stored terminals, so a network
+        with them is refused rather than written with different sources and sinks
+    '''
+    terminals_check_helper(flow)
+    for node in flow.flow_dict:
+        n = flow.get_node(node)
+        name = field_helper(node)
+        if n.outdegree() == 0 and n.indegree() == 0:
+            yield lone_helper(name)
+        for neighbor in n.neighbors():
+            yield name + '\t' + field_helper(neighbor) + '\t' + repr(n.arc_capacity(neighbor)) + '\n'
+
+def terminals_check_helper(flow):
+    ''' raise ValueError if the flow network has stored terminals '''
+    if flow.terminals is not None:
+        raise ValueError("an arc list cannot hold the stored sources and sinks, save it in the DIMACS or csr format")
+
+def write_flow(flow, output):
+    ''' write a flow network to a text file object '''
+    output.writelines(flow_lines(flow))
+
+def read_dimacs(lines, flow=None):
+    ''' read a flow network in the DIMACS max flow format. nodes are named by their
+        number unless a "c name number name" comment written by write_dimacs gives
+        their original name. the arcs are added in a single pass and the nodes marked
+        as sources and sinks become the network's stored terminals. returns the flow
+        network and the lists of nodes marked as sources and sinks
+    '''
+    if flow is None:
+        flow = Flow()
+    sources = []
+    sinks = []
+    flow.add_arcs_from(dimacs_arcs_helper(lines, flow, sources, sinks))
+    if sources and sinks:
+        flow.set_terminals(sources, sinks)
+    return flow, sources, sinks
+
+def dimacs_arcs_helper(lines, flow, sources, sinks):
+    ''' generator of the arcs of a DIMACS file for add_arcs_from. the nodes of the
+        problem line are added to flow and the marked terminals appended to sources
+        and sinks as they are read
+    '''
+    names = {}
+    for number, line in enumerate(lines, 1):
+        fields = line.split()
+        if not fields:
+            continue
+        if fields[0] == 'c':
+            if len(fields) >= 4 and fields[1] == 'name':
+                names[fields[2]] = line.split(None, 3)[3].rstrip('\r\n')
+        elif fields[0] == 'p':
+            if len(fields) != 4 or fields[1] != 'max':
+                raise ValueError("line " + str(number) + ": expected 'p max nodes arcs'")
+            for i in range(1, int(fields[2]) + 1):
+                flow.add_node(names.get(str(i), str(i)))
+        elif fields[0] == 'n':
+            if len(fields) != 3 or fields[2] not in ('s', 't'):
+                raise ValueError("line " + str(number) + ": expected 'n node s|t'")
+            if fields[2] == 's':
+                sources.append(names.get(fields[1], fields[1]))
+            else:
+                sinks.append(names.get(fields[1], fields[1]))
+        elif fields[0] == 'a':
+            if len(fields) != 4:
+                raise ValueError("line " + str(number) + ": expected 'a node neighbor capacity'")
+            yield names.get(fields[1], fields[1]), names.get(fields[2], fields[2]), float(fields[3])
+        else:
+            raise ValueError("line " + str(number) + ": unknown DIMACS line")
+
+def capacity_helper(capacity):
+    ''' returns a capacity as DIMACS text, whole numbers without a decimal point since
+        DIMACS max flow tools expect integer capacities
+    '''
+    if isinstance(capacity, float) and capacity.is_integer():
+        return str(int(capacity))
+    return repr(capacity)
+
+def dimacs_lines(flow, sources=None, sinks=None):
+    ''' generator of the lines of a flow network in the DIMACS max flow format. nodes
+        are numbered in order and their names are kept in comments. the stored
+        terminals of the network, or else its sources and sinks, are marked unless
+        others are given. a node without arcs is both a source and a sink of the
+        network, it is not marked as either since DIMACS does not allow that
+    '''
+    sources, sinks = flow.terminals_helper(sources, sinks)
+    if sources is None:
+        sources = [node for node in flow.sources() if node not in flow.sink_dict]
+    if sinks is None:
+        sinks = [node for node in flow.sinks() if node not in flow.source_dict]
+    if set(sources) & set(sinks):
+        raise ValueError("a node cannot be both a source and a sink")
+    number = {}
+    for node in flow.flow_dict:
+        number[node] = str(len(number) + 1)
+    for node in flow.flow_dict:
+        yield 'c name ' + number[node] + ' ' + name_helper(node) + '\n'
+    yield 'p max ' + str(flow.order()) + ' ' + str(flow.size()) + '\n'
+    for node in sources:
+        yield 'n ' + number[node] + ' s\n'
+    for node in sinks:
+        yield 'n ' + number[node] + ' t\n'
+    for node in flow.flow_dict:
+        n = flow.get_node(node)
+        for neighbor in n.neighbors():
+            yield 'a ' + number[node] + ' ' + number[neighbor] + ' ' + capacity_helper(n.arc_capacity(neighbor)) + '\n'
+
+def write_dimacs(flow, output, sources=None, sinks=None):
+    ''' write a flow network to a text file object in the DIMACS max flow format '''
+    output.writelines(dimacs_lines(flow, sources, sinks))
+
+def is_pickle(filename):
+    ''' returns true if the file was saved as a pickle by an older version '''
+    with open(filename, 'rb') as inputf:
+        return inputf.read(1) == b'\x80'
+
+def load_graph(filename):
+    ''' load a dependency graph from an edge list, a binary csr file, or a pickle saved
+        by an older version
+    '''
+    if csrfile.is_csr_file(filename):
+        return csrfile.load_graph(filename)
+    if is_pickle(filename):
+        with open(filename, 'rb') as inputf:
+            return pickle.load(inputf)
+    with open(filename, 'r', encoding='utf-8') as inputf:
+        return read_graph(inputf)
+
+def save_graph(graph, filename):
+    ''' save a dependency graph as an edge list, or as a binary csr file if the file
+        name ends in .csr
+    '''
+    if filename.endswith('.csr'):
+        csrfile.save(graph, filename)
+        return
+    with open(filename, 'w', encoding='utf-8') as output:
+        write_graph(graph, output)
+
+def load_flow(filename):
+    ''' load a flow network from an arc list, a DIMACS file ending in .max, a binary
+        csr file, or a pickle saved by an older version
+    '''
+    if csrfile.is_csr_file(filename):
+        return csrfile.load_flow(filename)
+    if is_pickle(filename):
+        with open(filename, 'rb') as inputf:
+            return pickle.load(inputf)
+    with open(filename, 'r', encoding='utf-8') as inputf:
+        if filename.endswith('.max'):
+            return read_dimacs(inputf)[0]
+        return read_flow(inputf)
+
+def save_flow(flow, filename):
+    ''' save a flow network as an arc list, in the DIMACS format if the file name
+        ends in .max, or as a binary csr file if it ends in .csr
+    '''
+    if filename.endswith('.csr'):
+        csrfile.save(flow, filename)
+        return
+    if not filename.endswith('.max'):
+        terminals_check_helper(flow)
+    with open(filename, 'w', encoding='utf-8') as output:
+        if filename.endswith('.max'):
+            write_dimacs(flow, output)
+        else:
+            write_flow(flow, output)
@@ -1,5 +1,9 @@
 from node import Node
-from copy import deepcopy
+from csr import CSR
+from flowresult import FlowResult
+from views import ArcView
+from maxflow import Incremental
+from array import array
 
 class Flow(object):
     ''' this is a flow network datastructure using a dictionary of node names as keys with
@@ -14,29 +18,49 @@ class Flow(object):
         self.flow_dict = {}
         self.node_count = 0
         self.arc_count = 0
+        #nodes without incoming and without outgoing arcs, kept up to date by the
+        #mutators so sources and sinks never scan the whole network
+        self.source_dict = {}
+        self.sink_dict = {}
+        #explicit (sources, sinks) lists, such as the terminals marked in a DIMACS
+        #file, used instead of the source and sink dictionaries when set
+        self.terminals = None
+        #version is bumped by every mutator, cached max flow results are only
+        #recomputed when theirs is stale
+        self.version = 0
+        self.cache = {}
+        #retained residual network of the last dinic max flow, repaired by the arc
+        #mutators and dropped when the sources or sinks change
+        self.incremental = None
 
     def nodes(self):
-        ''' returns the list of nodes in the flow network '''
-        return list(self.flow_dict.keys())
+        ''' returns a live view of the nodes in the flow network, copy it with list()
+            before removing nodes while iterating
+        '''
+        return self.flow_dict.keys()
 
     def order(self):
         ''' return the number of nodes in the graph '''
         return self.node_count
 
     def arcs(self):
-        ''' return the arcs of a graph '''
-        arc_list = []
-        #go through each node and append all its adjacencies and arc capacities
-        for node in self.flow_dict:
-            n = self.get_node(node)
-            for neighbor in n.neighbors():
-                arc_list.append((node, neighbor, n.arc_capacity(neighbor)))
-        return arc_list
+        ''' return a live view of the arcs of a graph as (node, neighbor, capacity) '''
+        return ArcView(self)
 
     def size(self):
         ''' return the numbers of arcs in the flow network '''
         return self.arc_count
 
+    def cached_helper(self, key, version, compute):
+        ''' return the cached result stored under key if it was computed at the given
+            version, otherwise compute and cache it
+        '''
+        entry = self.cache.get(key)
+        if entry is None or entry[0] != version:
+            entry = (version, compute())
+            self.cache[key] = entry
+        return entry[1]
+
     def get_node(self,node):
         ''' return the node object indicated by the key given '''
         if node in self.flow_dict:
@@ -50,23 +74,41 @@ class Flow(object):
             new_node = Node(node)
             self.flow_dict[node] = new_node
             self.node_count += 1
+            self.source_dict[node] = None
+            self.sink_dict[node] = None
+            self.version += 1
+            #a node without arcs carries no flow, the retained residual network only
+            #needs to know it for the arcs added to it later
+            if self.incremental is not None:
+                self.incremental.add_node(node)
             return True
         return False
 
     def remove_node(self, node):
         ''' remove node from graph, returns true if successful '''
         if node in self.flow_dict:
-            #remove the node from all adjacency lists of nodes
-            for n in self.flow_dict:
+            #remove the node from the adjacency lists of the nodes with arcs to it
+            for n in self.get_node(node).predecessors():
                 if self.get_node(n).remove_arc(node):
                     self.arc_count -= 1
+                    if self.get_node(n).outdegree() == 0:
+                        self.sink_dict[n] = None
             #modify all neighbors from this node
             for neighbor in self.get_node(node).neighbors():
                 self.get_node(neighbor).change_indegree(-1)
+                self.get_node(neighbor).remove_predecessor(node)
                 self.arc_count -= 1
+                if self.get_node(neighbor).indegree() == 0:
+                    self.source_dict[neighbor] = None
+            if self.terminals is not None:
+                self.remove_terminal_helper(node)
             #remove node from dictionary
             self.flow_dict.pop(node, None)
+            self.source_dict.pop(node, None)
+            self.sink_dict.pop(node, None)
             self.node_count -= 1
+            self.version += 1
+            self.incremental = None
             return True
         return False
 
@@ -77,116 +119,346 @@ class Flow(object):
             self.add_node(node)
         if neighbor not in self.flow_dict:
             self.add_node(neighbor)
+        #store the names held by the node table so the adjacency lists share them
+        node = self.get_node(node).name()
+        neighbor = self.get_node(neighbor).name()
         #if the adjacency didn't already exist create it and update values
-        if neighbor not in self.get_node(node).neighbors():
+        if not self.get_node(node).has_arc(neighbor):
             self.get_node(neighbor).change_indegree(1)
+            self.get_node(neighbor).add_predecessor(node)
             self.arc_count += 1
+            if neighbor in self.source_dict or node in self.sink_dict:
+                self.incremental = None
+            self.source_dict.pop(neighbor, None)
+            self.sink_dict.pop(node, None)
             new_node = True
         else:
             new_node = False
         #not a new adjacency, treat as update !!!!! will overwrite without warning
         self.get_node(node).add_arc(neighbor, capacity)
+        self.version += 1
+        if self.incremental is not None:
+            if new_node:
+                self.incremental.add_arc(node, neighbor, capacity)
+            else:
+                self.incremental.change_capacity(node, neighbor, capacity)
         return new_node
 
+    def add_arcs_from(self, arcs, capacities=None):
+        ''' add every (node, neighbor, capacity) triple of an iterable, a generator or
+            a numpy array in one pass, adding nodes as needed. when capacities is given
+            arcs holds (node, neighbor) pairs and capacities the parallel capacities,
+            which lets integer node ids and float capacities come from two arrays.
+            like add_arc, an arc the network already has gets the new capacity. the
+            retained max flow is dropped rather than repaired arc by arc. returns the
+            number of arcs added
+        '''
+        if hasattr(arcs, 'tolist'):
+            arcs = arcs.tolist()
+        if capacities is not None:
+            if hasattr(capacities, 'tolist'):
+                capacities = capacities.tolist()
+            arcs = ((arc[0], arc[1], capacity) for arc, capacity in zip(arcs, capacities))
+        flow_dict = self.flow_dict
+        added = 0
+        try:
+            for node, neighbor, capacity in arcs:
+                if node not in flow_dict:
+                    flow_dict[node] = Node(node)
+                    self.node_count += 1
+                    self.source_dict[node] = None
+                    self.sink_dict[node] = None
+                if neighbor not in flow_dict:
+                    flow_dict[neighbor] = Node(neighbor)
+                    self.node_count += 1
+                    self.source_dict[neighbor] = None
+                    self.sink_dict[neighbor] = None
+                n = flow_dict[node]
+                m = flow_dict[neighbor]
+                if not n.has_arc(neighbor):
+                    m.add_predecessor(n.name())
+                    m.change_indegree(1)
+                    self.source_dict.pop(neighbor, None)
+                    self.sink_dict.pop(node, None)
+                    added += 1
+                n.add_arc(m.name(), capacity)
+        finally:
+            self.arc_count += added
+            self.version += 1
+            self.incremental = None
+        return added
+
+    @classmethod
+    def from_arcs(cls, arcs, capacities=None):
+        ''' returns a new flow network built from an iterable of (node, neighbor,
+            capacity) triples, or of (node, neighbor) pairs and parallel capacities
+        '''
+        flow = cls()
+        flow.add_arcs_from(arcs, capacities)
+        return flow
+
     def remove_arc(self, node, neighbor):
         ''' remove arc from flow network '''
-        if node in self.flow_dict and neighbor in self.get_node(node).neighbors():
-            capacity = self.get_node(node).arc_capacity(neighbor)
+        if node in self.flow_dict and self.get_node(node).has_arc(neighbor):
             self.get_node(node).remove_arc(neighbor)
             self.get_node(neighbor).change_indegree(-1)
+            self.get_node(neighbor).remove_predecessor(node)
             self.arc_count -= 1
+            if self.get_node(neighbor).indegree() == 0:
+                self.source_dict[neighbor] = None
+                self.incremental = None
+            if self.get_node(node).outdegree() == 0:
+                self.sink_dict[node] = None
+                self.incremental = None
+            self.version += 1
+            if self.incremental is not None:
+                self.incremental.remove_arc(node, neighbor)
+            return True
+        return False
+
+    def change_capacity(self, node, neighbor, inc):
+        ''' change the capacity of an arc by inc amount, returns true if the arc exists.
+            a solved max flow is repaired instead of recomputed
+        '''
+        if node in self.flow_dict and self.get_node(node).has_arc(neighbor):
+            self.get_node(node).change_capacity(neighbor, inc)
+            self.version += 1
+            if self.incremental is not None:
+                self.incremental.change_capacity(node, neighbor, self.get_node(node).arc_capacity(neighbor))
             return True
         return False
 
+    def csr(self):
+        ''' returns an immutable compressed sparse row snapshot of the flow network '''
+        return CSR.from_flow(self)
+
+    def set_terminals(self, sources=None, sinks=None):
+        ''' flow between the given lists of sources and sinks by default instead of the
+            nodes without incoming or outgoing arcs, None for both restores that. a
+            node cannot be both a source and a sink
+        '''
+        if sources is None or sinks is None:
+            self.terminals = None
+        else:
+            for node in list(sources) + list(sinks):
+                if node not in self.flow_dict:
+                    raise ValueError("no node named " + str(node))
+            if set(sources) & set(sinks):
+                raise ValueError("a node cannot be both a source and a sink")
+            self.terminals = (list(sources), list(sinks))
+        self.version += 1
+        self.incremental = None
+
+    def terminals_helper(self, sources, sinks):
+        ''' fill in the sources or sinks that are not given from the stored terminals,
+            None is left for the nodes without incoming or outgoing arcs
+        '''
+        if self.terminals is not None:
+            if sources is None:
+                sources = self.terminals[0]
+            if sinks is None:
+                sinks = self.terminals[1]
+        return sources, sinks
+
+    def remove_terminal_helper(self, node):
+        ''' forget a removed node from the stored terminals, going back to the default
+            terminals once there are no sources or no sinks left
+        '''
+        sources = [n for n in self.terminals[0] if n != node]
+        sinks = [n for n in self.terminals[1] if n != node]
+        if sources and sinks:
+            self.terminals = (sources, sinks)
+        else:
+            self.terminals = None
+
     def get_flow(self):
         ''' returns the current max flow '''
         return self.max
 
-    def max_flow(self):
-        ''' returns max flow through the flow network
-            implemented using the Ford-Fulkerson algorithm
+    def max_flow(self, algorithm='dinic', sources=None, sinks=None, stats=None):
+        ''' returns max flow through the flow network. the algorithm can be 'dinic',
+            'push_relabel' or 'edmonds_karp', which all run on an integer indexed
+            residual network. the sources and sinks default to the stored terminals,
+            or else to every node without incoming or outgoing arcs. the value is the
+            one solve returns, so a max flow followed by a min cut runs the algorithm
+            once. with a Stats object the flow is computed from scratch and every
+            phase is recorded in it
         '''
-        if (not (self.sources() and self.sinks())) or self.node_count < 2:
+        result = self.solve(algorithm, sources, sinks, stats)
+        if result is False:
             return False
-        #create a deep copy for manipulating and this copy is a residual graph
-        #the residual graph represents the graph with the remaining space until
-        #maximum capacity
-        g = deepcopy(self)
-        #handle if there are back-edges because this algorithm uses back-edges
-        #and this datastructure only allows one edge (u,v) for any vertex u and v
-        for n in g.nodes():
-            for neighbor in g.get_node(n).neighbors():
-                if n in g.get_node(neighbor).neighbors():
-                    #there is a back-edge, create new in-between node with same capacities
-                    #as back-edge and remove original back-edge
-                    alt = neighbor + n
-                    while alt in g.nodes():
-                        alt += "'"
-                    g.add_arc(neighbor, alt, g.get_node(neighbor).arc_capacity(n))
-                    g.add_arc(alt, n, g.get_node(neighbor).arc_capacity(n))
-                    g.remove_arc(neighbor,n)
-        #create master source and sink to handle multiple sources and sinks if there are any
-        for s in self.sources():
-            g.add_arc('master_root', s, float("Inf"))
-        for t in self.sinks():
-            g.add_arc(t, 'master_sink', float("Inf"))
-        parent = {}
-        max_flow = 0
-        #breadth-first search to make sure there is path from source to sink
-        while g.max_flow_bfs('master_root', 'master_sink', parent):
-            path_flow = float("Inf")
-            s = 'master_sink'
-            #backtrack from sink to source and capture minimum available flow
-            while s != 'master_root':
-                path_flow = min (path_flow, g.get_node(parent[s]).arc_capacity(s))
-                s = parent[s]
-            #increase flow by the minimal maximum residual capacity
-            max_flow += path_flow
-            v = 'master_sink'
-            #update the residual capacities
-            while v != 'master_root':
-                u = parent[v]
-                g.get_node(u).change_capacity(v, -path_flow)
-                if u not in g.get_node(v).neighbors():
-                    g.add_arc(v, u, path_flow)
-                else:
-                    g.get_node(v).change_capacity(u, path_flow)
-                v = parent[v]
-        return max_flow
-
-    def max_flow_bfs(self, s, t, parent):
-        ''' breadth first search helper for max flow function '''
-        visited = []
-        queue = []
-        queue.append(s)
-        visited.append(s)
-        while queue:
-            n = queue.pop(0)
-            for neighbor in self.get_node(n).neighbors():
-                if neighbor not in visited and self.get_node(n).arc_capacity(neighbor) > 0:
-                    queue.append(neighbor)
-                    visited.append(neighbor)
-                    parent[neighbor] = n
-        if t in visited:
-            return True
-        else:
+        return result.value
+
+    def solve(self, algorithm='dinic', sources=None, sinks=None, stats=None):
+        ''' returns a FlowResult with the max flow, the flow on every arc and a minimum
+            cut, False if there is no source and sink. the result for the default
+            sources and sinks is cached until the network changes, so max_flow and
+            min_cut share a single run of the algorithm. for dinic the residual
+            network behind that result is kept, so after arc edits the flow is
+            repaired incrementally instead of solved again
+        '''
+        default = sources is None and sinks is None
+        sources, sinks = self.terminals_helper(sources, sinks)
+        if stats is not None:
+            return self.snapshot_helper(stats).solve(algorithm, sources, sinks, stats)
+        if not default:
+            return self.csr().solve(algorithm, sources, sinks)
+        if algorithm == 'dinic':
+            return self.cached_helper(('solve', algorithm), self.version, lambda: self.incremental_helper(sources, sinks))
+        return self.cached_helper(('solve', algorithm), self.version, lambda: self.csr().solve(algorithm, sources, sinks))
+
+    def incremental_helper(self, sources, sinks):
+        ''' returns the FlowResult of the retained dinic residual network. if an edit
+            dropped it the snapshot is solved from scratch, so a large network can be
+            handed to scipy, and that flow seeds a new residual network
+        '''
+        network = self.csr()
+        if self.incremental is None:
+            result = network.solve('dinic', sources, sinks)
+            if result is not False:
+                self.retain_helper(result, sources, sinks)
+            return result
+        if sources is None:
+            sources = self.sources()
+            sinks = self.sinks()
+        flows, side = self.incremental.read(network)
+        sources = network.terminals_helper(sources)
+        sinks = network.terminals_helper(sinks)
+        for i in sources:
+            side[i] = True
+        for i in sinks:
+            side[i] = False
+        return FlowResult(network, float(self.incremental.value), flows, side, sources, sinks)
+
+    def retain_helper(self, result, sources=None, sinks=None):
+        ''' keep the residual network of a dinic result for the default terminals,
+            the result must come from a snapshot of the network as it is now
+        '''
+        if sources is None:
+            sources = self.sources()
+            sinks = self.sinks()
+        self.incremental = Incremental(self.flow_dict, self.arcs(), sources, sinks, result.flows)
+
+    def snapshot_helper(self, stats):
+        ''' take a CSR snapshot, recording the time it took '''
+        start = stats.clock()
+        network = self.csr()
+        stats.record('snapshot', start, nodes=self.node_count, arcs=self.arc_count)
+        return network
+
+    def min_cut(self, algorithm='dinic', sources=None, sinks=None):
+        ''' returns the nodes on the source side of a minimum cut and the arcs crossing
+            it as (node, neighbor, capacity), False if there is no source and sink
+        '''
+        result = self.solve(algorithm, sources, sinks)
+        if result is False:
             return False
+        return result.min_cut()
+
+    def max_flows(self, pairs, algorithm='dinic'):
+        ''' returns the list of max flows between many (source, sink) pairs, sharing
+            one residual network between them
+        '''
+        return self.csr().max_flows(pairs, algorithm)
+
+    def gomory_hu(self):
+        ''' returns the Gomory-Hu tree of the flow network with its arcs made undirected,
+            cached until the network changes
+        '''
+        return self.cached_helper('gomory_hu', self.version, lambda: self.csr().gomory_hu())
 
     def sources(self):
-        ''' returns all the sources in the flow network '''
-        src = []
-        for n in self.nodes():
-            if self.get_node(n).indegree() == 0:
-                src.append(n)
-        return src
+        ''' returns a live view of the sources in the flow network '''
+        return self.source_dict.keys()
 
     def sinks(self):
-        ''' returns all the sinks in the flow network '''
-        snk = []
-        for n in self.nodes():
-            if not self.get_node(n).neighbors():
-                snk.append(n)
-        return snk
+        ''' returns a live view of the sinks in the flow network '''
+        return self.sink_dict.keys()
+
+    def __getstate__(self):
+        ''' pickle the flow network as its table of node names and integer arrays:
+            the CSR adjacency with the capacities parallel to the targets, so every
+            name is written once and no node object is pickled. cached results are
+            left out. capacities that are not all floats are kept as a list so they
+            come back unchanged
+        '''
+        names = list(self.flow_dict)
+        index = {}
+        for i in range(len(names)):
+            index[names[i]] = i
+        offsets = array('q', [0])
+        targets = array('q')
+        capacities = []
+        for name in names:
+            node = self.get_node(name)
+            for neighbor in node.neighbors():
+                targets.append(index[neighbor])
+                capacities.append(node.arc_capacity(neighbor))
+            offsets.append(len(targets))
+        if all(type(c) is float for c in capacities):
+            capacities = array('d', capacities)
+        return {'names': names,
+                'offsets': offsets,
+                'targets': targets,
+                'capacities': capacities,
+                'terminals': self.terminals,
+                'version': self.version}
+
+    def __setstate__(self, state):
+        ''' restore a pickled flow network from its name table and arrays, rebuilding
+            the reverse adjacency index and the source and sink sets of networks saved
+            by older versions
+        '''
+        if 'names' in state:
+            self.__init__()
+            self.compact_state_helper(state)
+            return
+        self.__dict__.update(state)
+        self.cache = {}
+        self.incremental = None
+        self.terminals = state.get('terminals')
+        if 'version' not in state:
+            self.version = 0
+        if 'source_dict' not in state:
+            for n in self.flow_dict.values():
+                n.clear_predecessors()
+            for node in self.flow_dict:
+                for neighbor in self.get_node(node).neighbors():
+                    self.get_node(neighbor).add_predecessor(node)
+            self.source_dict = {}
+            self.sink_dict = {}
+            for node in self.flow_dict:
+                if self.get_node(node).indegree() == 0:
+                    self.source_dict[node] = None
+                if self.get_node(node).outdegree() == 0:
+                    self.sink_dict[node] = None
+
+    def compact_state_helper(self, state):
+        ''' fill an empty flow network from the name table and arrays written by
+            __getstate__
+        '''
+        names = state['names']
+        offsets = state['offsets']
+        targets = state['targets']
+        capacities = state['capacities']
+        nodes = [Node(name) for name in names]
+        for i in range(len(names)):
+            self.flow_dict[names[i]] = nodes[i]
+        for i in range(len(names)):
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                nodes[i].add_arc(names[j], capacities[k])
+                nodes[j].add_predecessor(names[i])
+                nodes[j].change_indegree(1)
+        for i in range(len(names)):
+            if nodes[i].indegree() == 0:
+                self.source_dict[names[i]] = None
+            if nodes[i].outdegree() == 0:
+                self.sink_dict[names[i]] = None
+        self.node_count = len(names)
+        self.arc_count = len(targets)
+        self.terminals = state.get('terminals')
+        self.version = state['version']
 
     def __str__(self):
         ''' return string representation of flow network '''
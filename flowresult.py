@@ -0,0 +1,144 @@
+class FlowResult(object):
+    ''' outcome of a max flow computation on a CSR snapshot of a flow network. holds
+        the value of the maximum flow, the flow on every arc as an array parallel to
+        the snapshot's targets, and the source side of a minimum cut, all taken from
+        the final residual network so no question needs the algorithm to run again
+    '''
+
+    def __init__(self, network, value, flows, source_side, sources, sinks):
+        ''' create a result for the snapshot network, source_side flags the nodes on
+            the source side of the minimum cut and sources and sinks are the indices
+            of the terminals the flow was computed between
+        '''
+        self.network = network
+        self.value = value
+        self.flows = flows
+        self.side = source_side
+        self.sources = sources
+        self.sinks = sinks
+
+    def flow(self, node, neighbor):
+        ''' returns the flow on the arc (node,neighbor), None if there is no such arc '''
+        network = self.network
+        i = network.index(node)
+        j = network.index(neighbor)
+        if i is None or j is None:
+            return None
+        for k in range(network.offsets[i], network.offsets[i + 1]):
+            if network.targets[k] == j:
+                return self.flows[k]
+        return None
+
+    def arc_flows(self):
+        ''' generator of every arc as (node, neighbor, flow) '''
+        network = self.network
+        names = network.names
+        for i in range(len(names)):
+            for k in range(network.offsets[i], network.offsets[i + 1]):
+                yield names[i], names[network.targets[k]], self.flows[k]
+
+    def paths(self):
+        ''' generator of a decomposition of the flow into (path, amount) pairs, where
+            path is the list of nodes from a source to a sink. each path is followed
+            along arcs that still carry flow using a current arc pointer per node,
+            and cycles met on the way are cancelled since they add nothing to the
+            value, so the whole decomposition takes O(E * paths). with float
+            capacities a node can be reached over an arc that only carries rounding
+            error, that arc is dropped and the path backs up to try another one
+        '''
+        network = self.network
+        names = network.names
+        offsets = network.offsets
+        targets = network.targets
+        remaining = list(self.flows)
+        net = [0] * len(names)
+        for i in range(len(names)):
+            for k in range(offsets[i], offsets[i + 1]):
+                net[i] += remaining[k]
+                net[targets[k]] -= remaining[k]
+        supply = {}
+        for i in self.sources:
+            if net[i] > 0:
+                supply[i] = net[i]
+        demand = {}
+        for i in self.sinks:
+            if net[i] < 0:
+                demand[i] = -net[i]
+        current = [offsets[i] for i in range(len(names))]
+        for source in supply:
+            while supply[source] > 0:
+                path = [source]
+                arcs = []
+                position = {source: 0}
+                u = source
+                while demand.get(u, 0) <= 0:
+                    k = current[u]
+                    while k < offsets[u + 1] and remaining[k] <= 0:
+                        k += 1
+                    current[u] = k
+                    if k == offsets[u + 1]:
+                        #only rounding error is left on this node
+                        if not arcs:
+                            break
+                        remaining[arcs.pop()] = 0
+                        del position[path.pop()]
+                        u = path[-1]
+                        continue
+                    v = targets[k]
+                    if v in position:
+                        #cancel the cycle back to v and continue the path from there
+                        cycle = arcs[position[v]:] + [k]
+                        amount = min([remaining[a] for a in cycle])
+                        for a in cycle:
+                            remaining[a] -= amount
+                        for w in path[position[v] + 1:]:
+                            del position[w]
+                        del path[position[v] + 1:]
+                        del arcs[position[v]:]
+                        u = v
+                        continue
+                    position[v] = len(path)
+                    path.append(v)
+                    arcs.append(k)
+                    u = v
+                if demand.get(u, 0) <= 0:
+                    break
+                amount = min([supply[source], demand[u]] + [remaining[a] for a in arcs])
+                for a in arcs:
+                    remaining[a] -= amount
+                supply[source] -= amount
+                demand[u] -= amount
+                yield [names[i] for i in path], amount
+
+    def source_side(self):
+        ''' returns the nodes on the source side of the minimum cut '''
+        names = self.network.names
+        return [names[i] for i in range(len(names)) if self.side[i]]
+
+    def sink_side(self):
+        ''' returns the nodes on the sink side of the minimum cut '''
+        names = self.network.names
+        return [names[i] for i in range(len(names)) if not self.side[i]]
+
+    def cut_arcs(self):
+        ''' returns the arcs crossing the minimum cut as (node, neighbor, capacity),
+            their capacities add up to the value of the maximum flow
+        '''
+        network = self.network
+        names = network.names
+        side = self.side
+        arcs = []
+        for i in range(len(names)):
+            if side[i]:
+                for k in range(network.offsets[i], network.offsets[i + 1]):
+                    if not side[network.targets[k]]:
+                        arcs.append((names[i], names[network.targets[k]], network.capacities[k]))
+        return arcs
+
+    def min_cut(self):
+        ''' returns the source side of the minimum cut and the arcs crossing it '''
+        return self.source_side(), self.cut_arcs()
+
+    def __str__(self):
+        ''' return string representation of the result '''
+        return 'max flow: ' + str(self.value) + '\ncut: ' + str(self.cut_arcs())
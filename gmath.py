@@ -1,14 +1,22 @@
 #!/usr/bin/python
 
+import sys
+#with arguments, run the headless command line interface without loading tkinter
+if __name__ == '__main__' and len(sys.argv) > 1:
+    from cli import main
+    sys.exit(main(sys.argv[1:]))
+
 import tkinter as tk
 from tkinter.filedialog import askopenfilename
 from tkinter.filedialog import asksaveasfilename
 from tkinter.messagebox import askokcancel
 from tkinter.ttk import Notebook
 from tkinter.ttk import Style
-import pickle
 from graph import Graph
 from flow import Flow
+from worker import Worker
+from vlist import VirtualList
+import edgelist
 
 class App(tk.Frame):
     def __init__(self, master):
@@ -20,6 +28,9 @@ class App(tk.Frame):
         #get the application window, set title and basic attributes
         tk.Frame.__init__(self, master, background="#1d1d1d")
         self.pack()
+
+        #max flow runs in the background so editing never blocks
+        self.worker = Worker(self)
         self.master.title("gmath")
         self.master.resizable(True, True)
         self.master.tk_setPalette(background="#222222", foreground="#2ecc71")
@@ -132,10 +143,7 @@ class App(tk.Frame):
         edge_list_frame = tk.Frame(lists_frame, borderwidth=0)
         edge_list_frame.pack(side="left", padx=15)
         tk.Label(edge_list_frame, text="Edge List: ").pack(padx=5, pady=5)
-        edge_scrollbar = tk.Scrollbar(edge_list_frame, orient="vertical")
-        self.edge_list = tk.Listbox(edge_list_frame, selectmode='multiple', selectbackground="#2ecc71", selectforeground="#222222", yscrollcommand=edge_scrollbar.set, height=10, borderwidth=1)
-        edge_scrollbar.config(command=self.edge_list.yview)
-        edge_scrollbar.pack(side="right", fill="y")
+        self.edge_list = VirtualList(edge_list_frame, format=self.format_edge, selectmode='multiple', selectbackground="#2ecc71", selectforeground="#222222", height=10, borderwidth=1)
         self.edge_list.bind("<Delete>", self.remove_edge_list)
         self.edge_list.pack(side="left", fill="y", expand=1)
 
@@ -143,10 +151,7 @@ class App(tk.Frame):
         vertex_list_frame = tk.Frame(lists_frame, borderwidth=0)
         vertex_list_frame.pack(side="right", padx=15)
         tk.Label(vertex_list_frame, text="Vertex List: ").pack(padx=5, pady=5)
-        vertex_scrollbar = tk.Scrollbar(vertex_list_frame, orient="vertical")
-        self.vertex_list = tk.Listbox(vertex_list_frame, selectmode='multiple', selectbackground="#2ecc71", selectforeground="#222222", yscrollcommand=vertex_scrollbar.set, height=10, borderwidth=1)
-        vertex_scrollbar.config(command=self.vertex_list.yview)
-        vertex_scrollbar.pack(side="right", fill="y")
+        self.vertex_list = VirtualList(vertex_list_frame, selectmode='multiple', selectbackground="#2ecc71", selectforeground="#222222", height=10, borderwidth=1)
         self.vertex_list.bind("<Delete>", self.remove_vertex_list)
         self.vertex_list.pack(side="left", fill="y", expand=1)
 
@@ -183,10 +188,7 @@ class App(tk.Frame):
         tk.Label(output_top_sort_frame, text="Topological Sort: ").pack(padx=5, pady=0)
         top_sort_list_frame = tk.Frame(output_top_sort_frame, borderwidth=0)
         top_sort_list_frame.pack(pady=15)
-        top_sort_scrollbar = tk.Scrollbar(top_sort_list_frame, orient="vertical")
-        self.top_sort_list = tk.Listbox(top_sort_list_frame, yscrollcommand=top_sort_scrollbar.set, height=10, borderwidth=1)
-        top_sort_scrollbar.config(command=self.top_sort_list.yview)
-        top_sort_scrollbar.pack(side="right", fill="y")
+        self.top_sort_list = VirtualList(top_sort_list_frame, height=10, borderwidth=1)
         self.top_sort_list.pack(side="left", fill="y", expand=1)
         self.top_sort_button = tk.Button(output_top_sort_frame, text="Topological Sort", command=self.topological_sort)
         self.top_sort_button.bind("<Return>",self.topological_sort)
@@ -258,10 +260,7 @@ class App(tk.Frame):
         arc_list_frame = tk.Frame(flow_lists_frame, borderwidth=0)
         arc_list_frame.pack(side="left", padx=15)
         tk.Label(arc_list_frame, text="Arc List: ").pack(padx=5, pady=5)
-        arc_scrollbar = tk.Scrollbar(arc_list_frame, orient="vertical")
-        self.arc_list = tk.Listbox(arc_list_frame, selectmode='multiple', selectbackground="#2ecc71", selectforeground="#222222", yscrollcommand=edge_scrollbar.set, height=10, borderwidth=1)
-        arc_scrollbar.config(command=self.arc_list.yview)
-        arc_scrollbar.pack(side="right", fill="y")
+        self.arc_list = VirtualList(arc_list_frame, format=self.format_arc, selectmode='multiple', selectbackground="#2ecc71", selectforeground="#222222", height=10, borderwidth=1)
         self.arc_list.bind("<Delete>", self.remove_arc_list)
         self.arc_list.pack(side="left", fill="y", expand=1)
 
@@ -269,10 +268,7 @@ class App(tk.Frame):
         node_list_frame = tk.Frame(flow_lists_frame, borderwidth=0)
         node_list_frame.pack(side="right", padx=15)
         tk.Label(node_list_frame, text="Node List: ").pack(padx=5, pady=5)
-        node_scrollbar = tk.Scrollbar(node_list_frame, orient="vertical")
-        self.node_list = tk.Listbox(node_list_frame, selectmode='multiple', selectbackground="#2ecc71", selectforeground="#222222", yscrollcommand=vertex_scrollbar.set, height=10, borderwidth=1)
-        node_scrollbar.config(command=self.node_list.yview)
-        node_scrollbar.pack(side="right", fill="y")
+        self.node_list = VirtualList(node_list_frame, selectmode='multiple', selectbackground="#2ecc71", selectforeground="#222222", height=10, borderwidth=1)
         self.node_list.bind("<Delete>", self.remove_node_list)
         self.node_list.pack(side="left", fill="y", expand=1)
 
@@ -286,6 +282,8 @@ class App(tk.Frame):
         flow_output_arcs.pack()
         flow_output_max = tk.Frame(flow_output_frame, borderwidth=0)
         flow_output_max.pack()
+        flow_output_cut = tk.Frame(flow_output_frame, borderwidth=0)
+        flow_output_cut.pack()
         tk.Label(flow_output_nodes, text="Nodes: ").pack(padx=5, pady=5, side="left")
         self.nodes_label = tk.Label(flow_output_nodes, text="")
         self.nodes_label.pack(padx=10, pady=5, side="left")
@@ -295,6 +293,9 @@ class App(tk.Frame):
         tk.Label(flow_output_max, text="Maximum Flow: ").pack(padx=5, pady=5, side="left")
         self.max_label = tk.Label(flow_output_max, text="")
         self.max_label.pack(padx=10, pady=5, side="left")
+        tk.Label(flow_output_cut, text="Minimum Cut: ").pack(padx=5, pady=5, side="left")
+        self.cut_label = tk.Label(flow_output_cut, text="", wraplength=400, justify="left")
+        self.cut_label.pack(padx=10, pady=5, side="left")
 
         self.tabs.add(flow_frame, text="Flow Graph")
 
@@ -312,16 +313,18 @@ class App(tk.Frame):
         dependency_text = self.dependency_entry.get()
         dependent_text = self.dependent_entry.get()
         if dependency_text != "" and dependent_text != "" and dependency_text != dependent_text:
+            new_vertices = [v for v in (dependent_text, dependency_text) if v not in self.graphObj]
             if self.graphObj.add_edge(dependent_text,dependency_text):
                 if 'dpg' not in self.changed:
                     self.changed.append('dpg')
                 self.dependency_entry.delete(0, 'end')
                 self.dependent_entry.delete(0, 'end')
-                self.graphObj.is_cyclic()
-                self.edge_list.insert(tk.END, str(dependent_text)+" -> "+str(dependency_text))
                 self.update_output_labels()
                 self.change_button_state()
-                self.update_dep_lists()
+                for v in new_vertices:
+                    self.vertex_list.insert(v)
+                self.edge_list.insert((dependent_text, dependency_text))
+                self.topological_sort()
 
     def add_arc(self, event=None):
         '''  add an arc to the flow '''
@@ -329,12 +332,17 @@ class App(tk.Frame):
         arc_neighbor_text = self.arc_neighbor_entry.get()
         arc_capacity_text = self.arc_capacity_entry.get()
         if arc_node_text != '' and arc_neighbor_text != '' and arc_capacity_text.isnumeric() and float(arc_capacity_text) >= 0 and arc_node_text != arc_neighbor_text:
+            new_nodes = [n for n in (arc_node_text, arc_neighbor_text) if n not in self.flowObj.flow_dict]
+            old_arc = self.arc_helper(arc_node_text, arc_neighbor_text)
             self.flowObj.add_arc(arc_node_text, arc_neighbor_text, float(arc_capacity_text))
             self.update_flow_labels()
-            self.node_list.delete(0, 'end')
-            for e in self.flowObj.nodes():
-                self.node_list.insert(tk.END, str(e))
-            self.arc_list.insert(tk.END, str(arc_node_text)+" -("+str(arc_capacity_text)+")-> "+str(arc_neighbor_text))
+            for n in new_nodes:
+                self.node_list.insert(n)
+            arc = (arc_node_text, arc_neighbor_text, float(arc_capacity_text))
+            if old_arc is None:
+                self.arc_list.insert(arc)
+            else:
+                self.arc_list.replace(old_arc, arc)
             self.arc_node_entry.delete(0, 'end')
             self.arc_neighbor_entry.delete(0, 'end')
             self.arc_capacity_entry.delete(0, 'end')
@@ -348,46 +356,39 @@ class App(tk.Frame):
         dependent_text = self.dependent_entry.get()
         if dependency_text != "" and dependent_text != "":
             if self.graphObj.remove_edge(dependent_text,dependency_text):
-                self.graphObj.is_cyclic()
                 if 'dpg' not in self.changed:
                     self.changed.append('dpg')
                 self.dependency_entry.delete(0, 'end')
                 self.dependent_entry.delete(0, 'end')
                 self.update_output_labels()
                 self.change_button_state()
-                self.update_dep_lists()
+                self.edge_list.delete([(dependent_text, dependency_text)])
+                self.topological_sort()
 
     def remove_edge_list(self, event=None):
         ''' remove selected edges from edge list listbox '''
-        selections = [self.edge_list.get(x).split("->") for x in self.edge_list.curselection()]
-        #edge_sel = [x.strip() for x in "".split("->")]
-        values = []
-        for y in selections:
-            values.append([y[0].strip(), y[1].strip()])
-        for e in values:
+        removed = []
+        for e in self.edge_list.selected():
             if self.graphObj.remove_edge(e[0], e[1]):
+                removed.append(e)
                 if 'dpg' not in self.changed:
                     self.changed.append('dpg')
-                self.graphObj.is_cyclic()
-                self.update_output_labels()
-                self.change_button_state()
-        self.graphObj.is_cyclic()
         self.update_output_labels()
         self.change_button_state()
-        self.update_dep_lists()
+        self.edge_list.delete(removed)
+        self.topological_sort()
 
     def remove_arc(self, event=None):
         '''  '''
         arc_node_text = self.arc_node_entry.get()
         arc_neighbor_text = self.arc_neighbor_entry.get()
         if arc_node_text != '' and arc_neighbor_text != '':
+            arc = self.arc_helper(arc_node_text, arc_neighbor_text)
             if self.flowObj.remove_arc(arc_node_text, arc_neighbor_text):
                 self.update_flow_labels()
                 if 'flw' not in self.changed:
                     self.changed.append('flw')
-                self.arc_list.delete(0, 'end')
-                for e in self.flowObj.arcs():
-                    self.arc_list.insert(tk.END, str(e[0])+" -("+str(e[2])+")-> "+str(e[1]))
+                self.arc_list.delete([arc])
                 self.arc_node_entry.delete(0, 'end')
                 self.arc_neighbor_entry.delete(0, 'end')
                 self.arc_capacity_entry.delete(0, 'end')
@@ -395,24 +396,22 @@ class App(tk.Frame):
 
     def remove_arc_list(self, event=None):
         '''  '''
-        selections = [self.arc_list.get(x).split("-") for x in self.arc_list.curselection()]
-        values = []
-        for y in selections:
-            values.append([y[0].strip(), y[2][1:].strip()])
-        for e in values:
+        removed = []
+        for e in self.arc_list.selected():
             if self.flowObj.remove_arc(e[0],e[1]):
+                removed.append(e)
                 if 'flw' not in self.changed:
                     self.changed.append('flw')
-                self.update_flow_labels()
-                self.change_button_state()
-                self.update_flow_lists()
+        self.update_flow_labels()
+        self.change_button_state()
+        self.arc_list.delete(removed)
 
     def add_vertex(self, event=None):
         ''' simple add vertex to graph '''
         vertex_text = self.vertex_entry.get()
         if vertex_text != "":
             if self.graphObj.add_vertex(vertex_text):
-                self.vertex_list.insert(tk.END, str(vertex_text))
+                self.vertex_list.insert(vertex_text)
                 if 'dpg' not in self.changed:
                     self.changed.append('dpg')
                 self.vertex_entry.delete(0, 'end')
@@ -429,65 +428,94 @@ class App(tk.Frame):
                 self.node_entry.delete(0, 'end')
                 self.change_button_state()
                 self.update_flow_labels()
-                self.node_list.insert(tk.END, str(node_text))
+                self.node_list.insert(node_text)
 
     def remove_vertex(self, event=None):
         ''' simple remove vertex from graph '''
         vertex_text = self.vertex_entry.get()
-        if vertex_text != "":
+        if vertex_text != "" and vertex_text in self.graphObj:
+            edges = self.incident_edges_helper(vertex_text)
             if self.graphObj.remove_vertex(vertex_text):
                 if 'dpg' not in self.changed:
                     self.changed.append('dpg')
                 self.vertex_entry.delete(0, 'end')
-                self.graphObj.is_cyclic()
                 self.update_output_labels()
                 self.change_button_state()
-                self.update_dep_lists()
+                self.vertex_list.delete([vertex_text])
+                self.edge_list.delete(edges)
+                self.topological_sort()
 
     def remove_vertex_list(self, event=None):
         ''' removes all selected vertices from vertex listbox '''
-        values = [self.vertex_list.get(x).strip() for x in self.vertex_list.curselection()]
-        for v in values:
-            if self.graphObj.remove_vertex(v):
+        removed = []
+        edges = []
+        for v in self.vertex_list.selected():
+            if v in self.graphObj:
+                edges.extend(self.incident_edges_helper(v))
+                self.graphObj.remove_vertex(v)
+                removed.append(v)
                 if 'dpg' not in self.changed:
                     self.changed.append('dpg')
-                self.graphObj.is_cyclic()
-                self.update_output_labels()
-                self.change_button_state()
-        self.graphObj.is_cyclic()
         self.update_output_labels()
         self.change_button_state()
-        self.update_dep_lists()
+        self.vertex_list.delete(removed)
+        self.edge_list.delete(edges)
+        self.topological_sort()
 
     def remove_node(self, event=None):
         '''  '''
         node_text = self.node_entry.get()
-        if node_text != '':
+        if node_text != '' and node_text in self.flowObj.flow_dict:
+            arcs = self.incident_arcs_helper(node_text)
             if self.flowObj.remove_node(node_text):
                 self.update_flow_labels()
                 if 'flw' not in self.changed:
                     self.changed.append('flw')
                 self.node_entry.delete(0, 'end')
                 self.change_button_state()
-                self.update_flow_lists()
+                self.node_list.delete([node_text])
+                self.arc_list.delete(arcs)
 
     def remove_node_list(self, event=None):
         '''  '''
-        values = [self.node_list.get(x).strip() for x in self.node_list.curselection()]
-        for v in values:
-            if self.flowObj.remove_node(v):
+        removed = []
+        arcs = []
+        for v in self.node_list.selected():
+            if v in self.flowObj.flow_dict:
+                arcs.extend(self.incident_arcs_helper(v))
+                self.flowObj.remove_node(v)
+                removed.append(v)
                 if 'flw' not in self.changed:
                     self.changed.append('flw')
-                self.update_flow_labels()
-                self.change_button_state()
-                self.update_flow_lists()
-
-    def topological_sort(self):
-        ''' outputs the topological sort in scrollable listbox in order '''
+        self.update_flow_labels()
+        self.change_button_state()
+        self.node_list.delete(removed)
+        self.arc_list.delete(arcs)
+
+    def incident_edges_helper(self, vertex):
+        ''' the edge list rows into and out of a vertex, read before it is removed '''
+        v = self.graphObj.get_vertex(vertex)
+        return [(p, vertex) for p in v.predecessors()] + [(vertex, n) for n in v.neighbors()]
+
+    def incident_arcs_helper(self, node):
+        ''' the arc list rows into and out of a node, read before it is removed '''
+        n = self.flowObj.get_node(node)
+        arcs = [(p, node, self.flowObj.get_node(p).arc_capacity(node)) for p in n.predecessors()]
+        return arcs + [(node, m, n.arc_capacity(m)) for m in n.neighbors()]
+
+    def arc_helper(self, node, neighbor):
+        ''' the arc list row of an arc, None if the flow network has no such arc '''
+        n = self.flowObj.get_node(node)
+        if n is None or not n.has_arc(neighbor):
+            return None
+        return (node, neighbor, n.arc_capacity(neighbor))
+
+    def topological_sort(self, event=None):
+        ''' outputs the topological sort in scrollable listbox in order, the graph
+            keeps its dynamic order up to date as it is edited so nothing is sorted
+        '''
         if not self.graphObj.cycle_detected():
-            self.top_sort_list.delete(0, 'end')
-            for v in self.graphObj.topological_sort():
-                self.top_sort_list.insert(tk.END, str(v))
+            self.top_sort_list.set_items(self.graphObj.topological_sort())
 
     def click_exit(self, event=None):
         ''' exit program safely by asking if they want to save changes '''
@@ -510,23 +538,24 @@ class App(tk.Frame):
 
     def menu_save(self, event=None):
         ''' opens a "save as" dialog to save the graph '''
-        filename = asksaveasfilename(initialdir = ".",title = "Select file", filetypes=(("Dependency Graph", "*.dpg"),("Flow Network", "*.flw") ))
+        filename = asksaveasfilename(initialdir = ".",title = "Select file", filetypes=(("Dependency Graph", "*.dpg"),("Flow Network", "*.flw"),("DIMACS Flow Network", "*.max") ))
         try:
-            with open(filename, 'wb') as output:
-                if filename[-3:] == 'dpg':
-                    pickle.dump(self.graphObj, output, pickle.HIGHEST_PROTOCOL)
+            if filename[-3:] == 'dpg':
+                edgelist.save_graph(self.graphObj, filename)
+                if 'dpg' in self.changed:
                     self.changed.remove('dpg')
-                elif filename[-3:] == 'flw':
-                    pickle.dump(self.flowObj, output, pickle.HIGHEST_PROTOCOL)
+            elif filename[-3:] in ('flw', 'max'):
+                edgelist.save_flow(self.flowObj, filename)
+                if 'flw' in self.changed:
                     self.changed.remove('flw')
-                else:
-                    raise
+            else:
+                raise ValueError("unknown file type")
         except:
             print("Something went terribly wrong")
 
     def menu_open(self, event=None):
         ''' opens an "open file" dialog to open a graph file '''
-        filename = askopenfilename(initialdir = ".",title = "Select file",filetypes=(("Dependency Graph", "*.dpg"),("Flow Network", "*.flw") ))
+        filename = askopenfilename(initialdir = ".",title = "Select file",filetypes=(("Dependency Graph", "*.dpg"),("Flow Network", "*.flw"),("DIMACS Flow Network", "*.max") ))
         try:
             if filename[-3:] == 'dpg' and 'dpg' in self.changed:
                 result = askokcancel("Python","Would you like to save your changes to the dependency graph?")
@@ -536,7 +565,7 @@ class App(tk.Frame):
                         result = askokcancel("Python","Would you like to save your changes to the dependency graph?")
                     else:
                         result = False
-            elif filename[-3:] == 'flw' and 'flw' in self.changed:
+            elif filename[-3:] in ('flw', 'max') and 'flw' in self.changed:
                 result = askokcancel("Python","Would you like to save your changes to the flow network?")
                 while result == True:
                     self.menu_save()
@@ -544,42 +573,43 @@ class App(tk.Frame):
                         result = askokcancel("Python","Would you like to save your changes to the flow network?")
                     else:
                         result = False
-            with open(filename, 'rb') as inputf:
-                if filename[-3:] == 'dpg':
-                    self.graphObj = pickle.load(inputf)
-                    self.update_output_labels()
-                    self.change_button_state()
-                    self.update_dep_lists()
-                    if 'dpg' in self.changed:
-                        self.changed.remove('dpg')
-                elif filename[-3:] == 'flw':
-                    self.flowObj = pickle.load(inputf)
-                    self.update_flow_labels()
-                    self.change_button_state()
-                    self.update_flow_lists()
-                    if 'flw' in self.changed:
-                        self.changed.remove('flw')
+            if filename[-3:] == 'dpg':
+                self.graphObj = edgelist.load_graph(filename)
+                self.update_output_labels()
+                self.change_button_state()
+                self.update_dep_lists()
+                if 'dpg' in self.changed:
+                    self.changed.remove('dpg')
+            elif filename[-3:] in ('flw', 'max'):
+                self.flowObj = edgelist.load_flow(filename)
+                self.update_flow_labels()
+                self.change_button_state()
+                self.update_flow_lists()
+                if 'flw' in self.changed:
+                    self.changed.remove('flw')
         except:
             print("Something went terribly wrong")
 
     def update_dep_lists(self):
-        '''  '''
-        self.vertex_list.delete(0, 'end')
-        for e in self.graphObj.vertices():
-            self.vertex_list.insert(tk.END, str(e))
-        self.edge_list.delete(0, 'end')
-        for e in self.graphObj.edges():
-            self.edge_list.insert(tk.END, str(e[0])+" -> "+str(e[1]))
+        ''' fill the vertex and edge lists from the graph's views, the lists keep their
+            own copy and later edits update it in place
+        '''
+        self.vertex_list.set_items(self.graphObj.vertices())
+        self.edge_list.set_items(self.graphObj.edges())
         self.topological_sort()
 
     def update_flow_lists(self):
-        '''  '''
-        self.node_list.delete(0, 'end')
-        for e in self.flowObj.nodes():
-            self.node_list.insert(tk.END, str(e))
-        self.arc_list.delete(0, 'end')
-        for e in self.flowObj.arcs():
-            self.arc_list.insert(tk.END, str(e[0])+" -("+str(e[2])+")-> "+str(e[1]))
+        ''' fill the node and arc lists from the flow network's views '''
+        self.node_list.set_items(self.flowObj.nodes())
+        self.arc_list.set_items(self.flowObj.arcs())
+
+    def format_edge(self, edge):
+        ''' text of an edge list row '''
+        return str(edge[0])+" -> "+str(edge[1])
+
+    def format_arc(self, arc):
+        ''' text of an arc list row '''
+        return str(arc[0])+" -("+str(arc[2])+")-> "+str(arc[1])
 
     def update_output_labels(self):
         ''' update the vertex and edge count labels and the cycle detected label '''
@@ -588,14 +618,45 @@ class App(tk.Frame):
         self.cycle_label['text'] = str(self.graphObj.cycle_detected())
 
     def update_flow_labels(self):
-        ''' update arc and node count labels and max flow label '''
+        ''' update arc and node count labels and max flow label. while the network
+            keeps the residual network of its last max flow, which the arc edits
+            repair, the value and min cut are read off it. otherwise the max flow is
+            solved in the background and its residual network kept for the next edits
+        '''
         self.nodes_label['text'] = str(self.flowObj.order())
         self.arcs_label['text'] = str(self.flowObj.size())
-        mf = self.flowObj.max_flow()
-        if mf != False:
-            self.max_label['text'] = str(mf)
+        incremental = self.flowObj.incremental
+        if incremental is not None:
+            self.worker.cancel('max_flow')
+            self.max_label['text'] = str(float(incremental.value))
+            self.cut_label['text'] = self.format_cut(incremental.cut_arcs())
+            return
+        self.max_label['text'] = 'Computing...'
+        self.cut_label['text'] = ''
+        sources, sinks = self.flowObj.terminals_helper(None, None)
+        self.worker.submit('max_flow', self.flow_snapshot, lambda data, cancel: (data[0], data[1].solve('dinic', sources, sinks, cancel=cancel)), lambda answer: self.show_max_flow(answer, sources, sinks))
+
+    def flow_snapshot(self):
+        ''' returns the version of the flow network and a CSR snapshot of it '''
+        return self.flowObj.version, self.flowObj.csr()
+
+    def show_max_flow(self, answer, sources, sinks):
+        ''' update the max flow and min cut labels with a result from the background
+            worker, keeping its residual network if the network has not changed since
+        '''
+        version, result = answer
+        if result != False:
+            if version == self.flowObj.version and self.flowObj.incremental is None:
+                self.flowObj.retain_helper(result, sources, sinks)
+            self.max_label['text'] = str(result.value)
+            self.cut_label['text'] = self.format_cut(result.cut_arcs())
         else:
             self.max_label['text'] = 'Insufficient conditions'
+            self.cut_label['text'] = ''
+
+    def format_cut(self, arcs):
+        ''' format the arcs of a min cut for the cut label '''
+        return ', '.join([self.format_edge(a) for a in arcs])
 
     def change_button_state(self):
         ''' enable and disable buttons according to their ability to be used
@@ -0,0 +1,47 @@
+class GomoryHu(object):
+    ''' Gomory-Hu tree of an undirected network. every node but the root hangs off a
+        parent with the weight of a minimum cut between the two, and the minimum cut
+        between any two nodes is the smallest weight on the tree path between them,
+        so any number of queries are answered without another max flow
+    '''
+
+    def __init__(self, names, parent, weight):
+        ''' create a tree over the node names from the parent index and edge weight
+            of every node, the root has parent -1
+        '''
+        self.names = names
+        self.parent = parent
+        self.weight = weight
+        self.lookup = {}
+        for i in range(len(names)):
+            self.lookup[names[i]] = i
+        #Gusfield's algorithm only hangs a node under a lower index, so the depths
+        #can be filled in index order
+        self.depth = [0] * len(names)
+        for i in range(len(names)):
+            if parent[i] >= 0:
+                self.depth[i] = self.depth[parent[i]] + 1
+
+    def min_cut(self, node, neighbor):
+        ''' returns the value of a minimum cut between two nodes '''
+        if node not in self.lookup or neighbor not in self.lookup:
+            raise ValueError("no node named " + str(node if node not in self.lookup else neighbor))
+        u = self.lookup[node]
+        v = self.lookup[neighbor]
+        if u == v:
+            raise ValueError("a node cannot be both a source and a sink")
+        value = float("Inf")
+        while u != v:
+            if self.depth[u] < self.depth[v]:
+                u, v = v, u
+            value = min(value, self.weight[u])
+            u = self.parent[u]
+        return value
+
+    def edges(self):
+        ''' returns the tree edges as (node, parent, weight) '''
+        return [(self.names[i], self.names[self.parent[i]], self.weight[i]) for i in range(len(self.names)) if self.parent[i] >= 0]
+
+    def __str__(self):
+        ''' return string representation of the tree '''
+        return 'gomory-hu tree: ' + str(self.edges())
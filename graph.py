@@ -1,4 +1,8 @@
 from vertex import Vertex
+from csr import CSR
+from views import EdgeView
+from array import array
+import heapq
 
 class Graph(object):
     ''' simple unweighted directed acyclic graph class implemented by using vertex names
@@ -13,22 +17,48 @@ class Graph(object):
         self.vertex_count = 0
         self.edge_count = 0
         self.cyclic = False
+        #dynamic topological order kept up to date by the mutators, dependencies come
+        #first. topo_order maps positions in the range topo_low to topo_high to vertices,
+        #topo_index maps vertices to positions. edges that would close a cycle are not
+        #respected by the order and are kept in cycle_edges instead
+        self.topo_order = {}
+        self.topo_index = {}
+        self.topo_low = 0
+        self.topo_high = 0
+        self.cycle_edges = {}
+        #set when removals leave too many cycle edges to retry one by one, the order is
+        #then rebuilt once by the next query or edge insertion that needs it
+        self.order_dirty = False
+        #version is bumped by every mutator and order_version whenever the topological
+        #order changes, cached query results are only recomputed when theirs is stale
+        self.version = 0
+        self.order_version = 0
+        self.cache = {}
 
     def vertices(self):
-        ''' return the vertices of a graph '''
-        return list(self.graph_dict.keys())
+        ''' return a live view of the vertices of a graph, it follows later changes and
+            answers len and membership without copying. copy it with list() before
+            removing vertices while iterating
+        '''
+        return self.graph_dict.keys()
 
     def order(self):
         ''' return the number of vertices in the graph '''
         return self.vertex_count
 
     def edges(self):
-        ''' return the edges of a graph '''
-        edge_list = []
-        for vertex in self.graph_dict:
-            for neighbor in self.get_vertex(vertex).neighbors():
-                edge_list.append((vertex, neighbor))
-        return edge_list
+        ''' return a live view of the edges of a graph as (vertex, neighbor) pairs '''
+        return EdgeView(self)
+
+    def cached_helper(self, key, version, compute):
+        ''' return the cached result stored under key if it was computed at the given
+            version, otherwise compute and cache it
+        '''
+        entry = self.cache.get(key)
+        if entry is None or entry[0] != version:
+            entry = (version, compute())
+            self.cache[key] = entry
+        return entry[1]
 
     def size(self):
         ''' return the number of edges in the graph '''
@@ -36,6 +66,7 @@ class Graph(object):
 
     def cycle_detected(self):
         ''' returns true if the graph contains a cycle '''
+        self.settle_order_helper()
         return self.cyclic
 
     def get_vertex(self,vertex):
@@ -51,22 +82,37 @@ class Graph(object):
             new_vertex = Vertex(vertex)
             self.graph_dict[vertex] = new_vertex
             self.vertex_count += 1
+            self.topo_index[vertex] = self.topo_high
+            self.topo_order[self.topo_high] = vertex
+            self.topo_high += 1
+            self.version += 1
+            self.order_version += 1
             return True
         return False
 
     def remove_vertex(self, vertex):
-        ''' remove a vertex by removing it from adjacency lists and popping from dictionary
-            returns true if successful
+        ''' remove a vertex by removing it from the adjacency lists of the vertices
+            adjacent to it and popping from dictionary, returns true if successful
         '''
         if vertex in self.graph_dict:
-            for v in self.graph_dict:
-                if self.get_vertex(v).remove_edge(vertex):
+            v = self.get_vertex(vertex)
+            for predecessor in v.predecessors():
+                if self.get_vertex(predecessor).remove_edge(vertex):
+                    self.cycle_edges.pop((predecessor, vertex), None)
                     self.edge_count -= 1
-            for neighbor in self.get_vertex(vertex).neighbors():
+            for neighbor in v.neighbors():
                 self.get_vertex(neighbor).change_indegree(-1)
+                self.get_vertex(neighbor).remove_predecessor(vertex)
+                self.cycle_edges.pop((vertex, neighbor), None)
                 self.edge_count -= 1
             self.graph_dict.pop(vertex, None)
             self.vertex_count -= 1
+            del self.topo_order[self.topo_index.pop(vertex)]
+            if self.topo_high - self.topo_low > 2 * self.vertex_count + 16:
+                self.compact_order_helper()
+            self.version += 1
+            self.order_version += 1
+            self.retry_cycle_edges_helper()
             return True
         return False
 
@@ -74,86 +120,534 @@ class Graph(object):
         ''' add an edge to the graph, add vertices if necessary 
             returns true if successful
         '''
+        self.settle_order_helper()
         self.add_vertex(vertex)
-        self.add_vertex(neighbor)
+        if self.add_vertex(neighbor) and vertex != neighbor:
+            #a new dependency has no edges yet, putting it first keeps the order valid
+            #without a search, so chains built from the top down stay linear
+            del self.topo_order[self.topo_index[neighbor]]
+            self.topo_high -= 1
+            self.topo_low -= 1
+            self.topo_index[neighbor] = self.topo_low
+            self.topo_order[self.topo_low] = neighbor
+            self.order_version += 1
+        #store the names held by the vertex table so the adjacency lists share them
+        vertex = self.get_vertex(vertex).name()
+        neighbor = self.get_vertex(neighbor).name()
         success = self.get_vertex(vertex).add_edge(neighbor)
         if success:
             self.get_vertex(neighbor).change_indegree(1)
+            self.get_vertex(neighbor).add_predecessor(vertex)
             self.edge_count += 1
+            self.version += 1
+            if not self.reorder_helper(vertex, neighbor):
+                self.cycle_edges[(vertex, neighbor)] = None
+                self.cyclic = True
         return success
 
+    def add_edges_from(self, edges):
+        ''' add every (vertex, neighbor) pair of an iterable, a generator or a two column
+            numpy array in one pass, adding vertices as needed and skipping edges the
+            graph already has. the adjacency lists and indegrees are filled directly
+            and the topological order is rebuilt once at the end in O(V+E), even when
+            the iterable raises part way, so add_edge is cheaper for a handful of
+            edges on a large graph. returns the number of edges added
+        '''
+        if hasattr(edges, 'tolist'):
+            edges = edges.tolist()
+        graph_dict = self.graph_dict
+        added = 0
+        try:
+            for vertex, neighbor in edges:
+                if vertex not in graph_dict:
+                    graph_dict[vertex] = Vertex(vertex)
+                    self.vertex_count += 1
+                if neighbor not in graph_dict:
+                    graph_dict[neighbor] = Vertex(neighbor)
+                    self.vertex_count += 1
+                v = graph_dict[vertex]
+                w = graph_dict[neighbor]
+                if v.add_edge(w.name()):
+                    w.add_predecessor(v.name())
+                    w.change_indegree(1)
+                    added += 1
+        finally:
+            self.edge_count += added
+            self.version += 1
+            self.rebuild_order()
+        return added
+
+    @classmethod
+    def from_edges(cls, edges):
+        ''' returns a new graph built from an iterable of (vertex, neighbor) pairs '''
+        graph = cls()
+        graph.add_edges_from(edges)
+        return graph
+
+    def creates_cycle(self, vertex, neighbor):
+        ''' returns true if adding the edge (vertex, neighbor) would close a cycle,
+            only searching the part of the topological order between the two
+        '''
+        self.settle_order_helper()
+        if vertex not in self.graph_dict or neighbor not in self.graph_dict:
+            return vertex == neighbor
+        if self.get_vertex(vertex).has_edge(neighbor):
+            return (vertex, neighbor) in self.cycle_edges
+        if vertex == neighbor:
+            return True
+        if self.topo_index[neighbor] < self.topo_index[vertex]:
+            return False
+        return self.order_search_helper(vertex, neighbor, self.topo_index[neighbor], True) is None
+
     def remove_edge(self, vertex, neighbor):
-        ''' remove an edge from the graph '''
-        if vertex in self.graph_dict:
-            success = self.get_vertex(vertex).remove_edge(neighbor)
+        ''' remove an edge from the graph, returns true if successful '''
+        if vertex in self.graph_dict and self.get_vertex(vertex).remove_edge(neighbor):
             self.get_vertex(neighbor).change_indegree(-1)
+            self.get_vertex(neighbor).remove_predecessor(vertex)
             self.edge_count -= 1
-            return success
+            self.version += 1
+            self.cycle_edges.pop((vertex, neighbor), None)
+            self.retry_cycle_edges_helper()
+            return True
         return False
 
+    def order_search_helper(self, start, stop, bound, forward):
+        ''' depth first search used by the dynamic topological order. a forward
+            search follows dependents of start positioned at or before bound, a
+            backward search follows dependencies positioned at or after bound.
+            returns the vertices found, or None if the search reached stop
+        '''
+        index = self.topo_index
+        found = {start: None}
+        stack = [start]
+        while stack:
+            x = stack.pop()
+            if forward:
+                following = self.get_vertex(x).predecessors()
+            else:
+                following = self.get_vertex(x).neighbors()
+            for w in following:
+                if w in found:
+                    continue
+                if self.cycle_edges and ((w, x) if forward else (x, w)) in self.cycle_edges:
+                    continue
+                if w == stop:
+                    return None
+                if (forward and index[w] <= bound) or (not forward and index[w] >= bound):
+                    found[w] = None
+                    stack.append(w)
+        return found
+
+    def reorder_helper(self, vertex, neighbor):
+        ''' Pearce-Kelly online topological ordering. vertex now depends on neighbor,
+            so if neighbor is ordered after vertex, the dependents of vertex and the
+            dependencies of neighbor between them are shuffled so neighbor and its
+            dependencies come first. only that region of the order is visited.
+            returns false without changing the order if the edge closes a cycle
+        '''
+        if vertex == neighbor:
+            return False
+        index = self.topo_index
+        lower = index[vertex]
+        upper = index[neighbor]
+        if upper < lower:
+            return True
+        dependents = self.order_search_helper(vertex, neighbor, upper, True)
+        if dependents is None:
+            return False
+        dependencies = self.order_search_helper(neighbor, vertex, lower, False)
+        dependents = sorted(dependents, key=index.get)
+        dependencies = sorted(dependencies, key=index.get)
+        positions = sorted([index[v] for v in dependencies] + [index[v] for v in dependents])
+        for position, v in zip(positions, dependencies + dependents):
+            index[v] = position
+            self.topo_order[position] = v
+        self.order_version += 1
+        return True
+
+    def retry_cycle_edges_helper(self):
+        ''' after a removal, edges that used to close a cycle may fit into the order
+            again. the graph is cyclic exactly while some edge still does not fit
+        '''
+        #every retry can search a large part of the order, past a handful of edges a
+        #single rebuild in O(V+E) is cheaper. it is left to settle_order_helper so a
+        #run of removals pays for one rebuild. until then the order still respects
+        #every edge outside cycle_edges, some of those may merely fit again
+        if self.order_dirty or len(self.cycle_edges) > 16:
+            self.order_dirty = True
+            return
+        for edge in list(self.cycle_edges):
+            del self.cycle_edges[edge]
+            if not self.reorder_helper(edge[0], edge[1]):
+                self.cycle_edges[edge] = None
+        self.cyclic = len(self.cycle_edges) > 0
+
+    def settle_order_helper(self):
+        ''' rebuild the order if removals marked it dirty '''
+        if self.order_dirty:
+            self.rebuild_order()
+
+    def compact_order_helper(self):
+        ''' drop the positions of removed vertices from the topological order '''
+        order = [self.topo_order[i] for i in range(self.topo_low, self.topo_high) if i in self.topo_order]
+        self.topo_order = {}
+        for i in range(len(order)):
+            self.topo_order[i] = order[i]
+            self.topo_index[order[i]] = i
+        self.topo_low = 0
+        self.topo_high = len(order)
+
+    def rebuild_order(self):
+        ''' rebuild the dynamic topological order from scratch with a depth first
+            search. the edges the search finds going backwards are exactly the ones
+            that close cycles
+        '''
+        order = self.topological_sort_dfs()
+        self.topo_order = {}
+        self.topo_index = {}
+        for i in range(len(order)):
+            self.topo_order[i] = order[i]
+            self.topo_index[order[i]] = i
+        self.topo_low = 0
+        self.topo_high = len(order)
+        self.order_version += 1
+        self.order_dirty = False
+        self.cycle_edges = {}
+        for vertex in self.graph_dict:
+            for neighbor in self.get_vertex(vertex).neighbors():
+                if self.topo_index[neighbor] >= self.topo_index[vertex]:
+                    self.cycle_edges[(vertex, neighbor)] = None
+        self.cyclic = len(self.cycle_edges) > 0
+
     def indegree(self, vertex):
         ''' returns the indegree of a vertex in the graph '''
         if vertex in self.graph_dict:
             return self.get_vertex(vertex).indegree()
 
-    def is_cyclic_helper(self, i, color):
-        ''' the driver of the cycle detector using recursion and a coloring method.
-            if during the depth first search a gray vertex is discovered, then there
-            is a back-edge, meaning there is a cycle
-        '''
-        color[i] = "gray"
-        for v in self.get_vertex(i).neighbors():
-            if color[v] == "gray":
-                return True
-            if color[v] == "white" and self.is_cyclic_helper(v, color) == True:
-                return True
-        color[i] = "black"
-        return False
- 
-    def is_cyclic(self):
-        ''' modified recursive depth first seach using a coloring method to track
-            visited vertices and check for any back-edges that cause cycles. original
-            pseudocode algorithm published in introduction to algorithms, rivest pg 604
+    def is_cyclic(self, stats=None):
+        ''' modified depth first seach using a coloring method to track visited
+            vertices and check for any back-edges that cause cycles. original
+            pseudocode algorithm published in introduction to algorithms, rivest pg 604.
+            the search keeps an explicit stack of neighbor iterators instead of
+            recursing, so chains of any depth are safe. the search is recorded in
+            stats if given
         '''
+        if stats is not None:
+            start = stats.clock()
         color = {}
-        for v in self.vertices():
+        for v in self.graph_dict:
             color[v] = "white"
-        for v in self.vertices():
-            if color[v] == "white":
-                if self.is_cyclic_helper(v, color) == True:
-                    self.cyclic = True
-                    return True
+        for v in self.graph_dict:
+            if color[v] != "white":
+                continue
+            color[v] = "gray"
+            stack = [(v, iter(self.get_vertex(v).neighbors()))]
+            while stack:
+                u, neighbors = stack[-1]
+                for w in neighbors:
+                    if color[w] == "gray":
+                        self.cyclic = True
+                        if stats is not None:
+                            stats.record('is_cyclic', start, vertices_visited=len([u for u in color if color[u] != "white"]))
+                        return True
+                    if color[w] == "white":
+                        color[w] = "gray"
+                        stack.append((w, iter(self.get_vertex(w).neighbors())))
+                        break
+                else:
+                    color[u] = "black"
+                    stack.pop()
         self.cyclic = False
+        if stats is not None:
+            stats.record('is_cyclic', start, vertices_visited=len(color), edges_scanned=self.edge_count)
         return False
 
     def roots(self):
-        ''' returns vertices that no other vertex is adjacent to '''
+        ''' returns a tuple of the vertices that no other vertex is adjacent to,
+            cached until the graph changes
+        '''
+        return self.cached_helper('roots', self.version, self.roots_helper)
+
+    def roots_helper(self):
+        ''' build the tuple of roots of a graph '''
         root = []
-        for v in self.vertices():
+        for v in self.graph_dict:
             if self.get_vertex(v).indegree() == 0:
                 root.append(v)
-        return root
+        return tuple(root)
 
-    def topological_sort_helper(self, v, visited, stack):
-        ''' recursive helper function for topological sort using depth first search '''
-        visited[v] = True
-        for i in self.get_vertex(v).neighbors():
-            if visited[i] == False:
-                self.topological_sort_helper(i, visited, stack)
-        stack.append(v)
+    def topological_sort(self, method='dynamic', stats=None):
+        ''' give an acceptable order of resolution of dependencies, dependencies come
+            before their dependents. the method can be 'dynamic', the order the graph
+            maintains as it is edited, 'dfs', an iterative depth first search, or
+            'kahn', which repeatedly removes vertices nothing depends on. the dynamic
+            order is returned as a tuple that is cached until the order changes, a
+            cyclic graph falls back to a cached depth first search. the sort is
+            recorded in stats if given with the vertices and edges it actually went
+            through, a cached order is not recorded at all
+        '''
+        if stats is None:
+            return self.topological_sort_helper(method, None)
+        start = stats.clock()
+        counts = {}
+        order = self.topological_sort_helper(method, counts)
+        if counts:
+            stats.record('topological_sort.' + method, start, **counts)
+        return order
+
+    def topological_sort_helper(self, method, counts):
+        ''' run the sort for a method, adding up what it scanned in counts if given '''
+        if method == 'dynamic':
+            if self.order_dirty and counts is not None:
+                #the rebuild is a depth first search followed by a pass over every edge
+                self.count_helper(counts, self.graph_dict, len(self.graph_dict), 2 * self.edge_count)
+            self.settle_order_helper()
+            if self.cyclic:
+                return self.cached_helper('dfs', self.version, lambda: tuple(self.topological_sort_dfs(counts)))
+            return self.cached_helper('order', self.order_version, lambda: self.topological_order_helper(counts))
+        if method == 'dfs':
+            return self.topological_sort_dfs(counts)
+        if method == 'kahn':
+            return self.topological_sort_kahn(counts)
+        raise ValueError("unknown topological sort method: " + str(method))
 
-    def topological_sort(self):
-        ''' recursive depth first search to give an acceptable
-            order of resolution of dependencies
+    def count_helper(self, counts, vertices, visited, edges=None):
+        ''' add the visited vertices and the scanned edges, every edge out of the given
+            vertices unless edges is given, to counts when it is not None
+        '''
+        if counts is None:
+            return
+        if edges is None:
+            edges = sum([self.get_vertex(v).outdegree() for v in vertices])
+        counts['vertices_visited'] = counts.get('vertices_visited', 0) + visited
+        counts['edges_scanned'] = counts.get('edges_scanned', 0) + edges
+
+    def topological_order_helper(self, counts=None):
+        ''' read the dynamic topological order into a tuple '''
+        order = self.topo_order
+        result = tuple([order[i] for i in range(self.topo_low, self.topo_high) if i in order])
+        self.count_helper(counts, result, len(result), 0)
+        return result
+
+    def topological_sort_dfs(self, counts=None):
+        ''' depth first search appending each vertex after all of its dependencies,
+            using an explicit stack of neighbor iterators instead of recursion. the
+            neighbors of every vertex are all scanned, which is added to counts if given
         '''
         visited = {}
-        for i in self.vertices():
+        for i in self.graph_dict:
             visited[i] = False
-        stack =[]
-        for i in self.vertices():
-            if visited[i] == False:
-                self.topological_sort_helper(i, visited, stack)
-        return stack
+        order = []
+        for i in self.graph_dict:
+            if visited[i]:
+                continue
+            visited[i] = True
+            stack = [(i, iter(self.get_vertex(i).neighbors()))]
+            while stack:
+                v, neighbors = stack[-1]
+                for w in neighbors:
+                    if not visited[w]:
+                        visited[w] = True
+                        stack.append((w, iter(self.get_vertex(w).neighbors())))
+                        break
+                else:
+                    order.append(v)
+                    stack.pop()
+        self.count_helper(counts, order, len(order), self.edge_count)
+        return order
+
+    def topological_sort_kahn(self, counts=None):
+        ''' Kahn's algorithm driven by the indegrees the vertices already track. the
+            roots are peeled off first, then every vertex whose dependents have all
+            been removed, and the result is reversed so dependencies come first.
+            vertices on or depending on a cycle are left out and their edges are not
+            scanned, what was scanned is added to counts if given
+        '''
+        indegree = {}
+        queue = []
+        for v in self.graph_dict:
+            indegree[v] = self.get_vertex(v).indegree()
+            if indegree[v] == 0:
+                queue.append(v)
+        i = 0
+        while i < len(queue):
+            for w in self.get_vertex(queue[i]).neighbors():
+                indegree[w] -= 1
+                if indegree[w] == 0:
+                    queue.append(w)
+            i += 1
+        self.count_helper(counts, queue, len(queue))
+        queue.reverse()
+        return queue
+
+    def levels(self):
+        ''' returns the dependency waves of the graph as a tuple of tuples. the first
+            wave is every vertex without dependencies and each later wave is every
+            vertex whose dependencies are all in earlier waves, so the vertices of a
+            wave can all be resolved at the same time. vertices on or depending on a
+            cycle are left out. cached until the graph changes
+        '''
+        return self.cached_helper('levels', self.version, self.levels_helper)
+
+    def levels_helper(self):
+        ''' peel off the vertices whose dependencies are done one wave at a time '''
+        remaining = {}
+        wave = []
+        for v in self.graph_dict:
+            remaining[v] = self.get_vertex(v).outdegree()
+            if remaining[v] == 0:
+                wave.append(v)
+        waves = []
+        while wave:
+            waves.append(tuple(wave))
+            next_wave = []
+            for v in wave:
+                for dependent in self.get_vertex(v).predecessors():
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        next_wave.append(dependent)
+            wave = next_wave
+        return tuple(waves)
+
+    def schedule(self, workers=1, cost=None):
+        ''' list schedule of the graph on a number of workers, returned as a list of
+            (vertex, worker, start, finish) tuples ordered by start time. the cost of
+            a vertex comes from calling cost or looking it up in it, and is 1 if cost
+            is None. whenever a worker is free it takes the ready vertex with the
+            longest remaining path of dependents, which keeps the critical path moving.
+            vertices on or depending on a cycle are left out
+        '''
+        if workers < 1:
+            raise ValueError("a schedule needs at least one worker")
+        duration = {}
+        for v in self.graph_dict:
+            if cost is None:
+                duration[v] = 1
+            elif callable(cost):
+                duration[v] = cost(v)
+            else:
+                duration[v] = cost[v]
+        #longest path from each vertex through its dependents, dependents go first
+        waves = self.levels()
+        priority = {}
+        for wave in reversed(waves):
+            for v in wave:
+                longest = 0
+                for dependent in self.get_vertex(v).predecessors():
+                    if dependent in priority and priority[dependent] > longest:
+                        longest = priority[dependent]
+                priority[v] = duration[v] + longest
+        remaining = {}
+        ready = []
+        order = 0
+        for v in priority:
+            remaining[v] = self.get_vertex(v).outdegree()
+            if remaining[v] == 0:
+                heapq.heappush(ready, (-priority[v], order, v))
+                order += 1
+        idle = list(range(workers))
+        running = []
+        result = []
+        time = 0
+        while ready or running:
+            #hand out ready vertices to idle workers, lowest numbered worker first
+            idle.sort(reverse=True)
+            while ready and idle:
+                v = heapq.heappop(ready)[2]
+                worker = idle.pop()
+                result.append((v, worker, time, time + duration[v]))
+                heapq.heappush(running, (time + duration[v], worker, v))
+            #advance to the next finish and release the dependents it unblocks
+            time, worker, v = heapq.heappop(running)
+            finished = [(worker, v)]
+            while running and running[0][0] == time:
+                finished.append(heapq.heappop(running)[1:])
+            for worker, v in finished:
+                idle.append(worker)
+                for dependent in self.get_vertex(v).predecessors():
+                    if dependent not in remaining:
+                        continue
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        heapq.heappush(ready, (-priority[dependent], order, dependent))
+                        order += 1
+        return result
+
+    def csr(self):
+        ''' returns an immutable compressed sparse row snapshot of the graph '''
+        return CSR.from_graph(self)
+
+    def __getstate__(self):
+        ''' pickle the graph as its table of vertex names and integer arrays: the CSR
+            adjacency, the topological order and the cycle edges as indices into the
+            table, so every name is written once and no vertex object is pickled.
+            cached query results are left out
+        '''
+        self.settle_order_helper()
+        network = self.csr()
+        cycle_edges = array('q')
+        for edge in self.cycle_edges:
+            cycle_edges.append(network.index(edge[0]))
+            cycle_edges.append(network.index(edge[1]))
+        return {'names': list(network.names),
+                'offsets': network.offsets,
+                'targets': network.targets,
+                'order': array('q', [network.index(v) for v in self.topological_order_helper()]),
+                'cycle_edges': cycle_edges,
+                'version': self.version,
+                'order_version': self.order_version}
+
+    def __setstate__(self, state):
+        ''' restore a pickled graph from its name table and integer arrays, rebuilding
+            the reverse adjacency index and the topological order of graphs saved by
+            older versions
+        '''
+        if 'names' in state:
+            self.__init__()
+            self.compact_state_helper(state)
+            return
+        self.__dict__.update(state)
+        self.cache = {}
+        self.order_dirty = state.get('order_dirty', False)
+        if 'version' not in state:
+            self.version = 0
+            self.order_version = 0
+        if any(v.predecessors() is None for v in self.graph_dict.values()):
+            for v in self.graph_dict.values():
+                v.clear_predecessors()
+            for vertex in self.graph_dict:
+                for neighbor in self.get_vertex(vertex).neighbors():
+                    self.get_vertex(neighbor).add_predecessor(vertex)
+        if 'topo_order' not in state:
+            self.rebuild_order()
+
+    def compact_state_helper(self, state):
+        ''' fill an empty graph from the name table and arrays written by __getstate__ '''
+        names = state['names']
+        offsets = state['offsets']
+        targets = state['targets']
+        vertices = [Vertex(name) for name in names]
+        for i in range(len(names)):
+            self.graph_dict[names[i]] = vertices[i]
+        for i in range(len(names)):
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                vertices[i].add_edge(names[j])
+                vertices[j].add_predecessor(names[i])
+                vertices[j].change_indegree(1)
+        self.vertex_count = len(names)
+        self.edge_count = len(targets)
+        order = state['order']
+        for i in range(len(order)):
+            self.topo_order[i] = names[order[i]]
+            self.topo_index[names[order[i]]] = i
+        self.topo_high = len(order)
+        cycle_edges = state['cycle_edges']
+        for k in range(0, len(cycle_edges), 2):
+            self.cycle_edges[(names[cycle_edges[k]], names[cycle_edges[k + 1]])] = None
+        self.cyclic = len(self.cycle_edges) > 0
+        self.version = state['version']
+        self.order_version = state['order_version']
 
     def __contains__(self,vertex):
         ''' contains method for graph '''
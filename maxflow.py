@@ -0,0 +1,566 @@
+import math
+from collections import deque
+from array import array
+
+class Cancelled(Exception):
+    ''' raised by an algorithm whose cancel token was set while it ran '''
+
+def cancel_helper(cancel):
+    ''' raise Cancelled if the cancel token, anything with an is_set method such as a
+        threading.Event, has been set. the algorithms check it once per phase
+    '''
+    if cancel is not None and cancel.is_set():
+        raise Cancelled()
+
+class Residual(object):
+    ''' residual network indexed by integers instead of node names. every arc is
+        stored in a pair of slots, arc a and its reverse arc a ^ 1, so pushing flow
+        along an arc never has to look up or create a back-edge
+    '''
+
+    def __init__(self, n):
+        ''' create a residual network with n nodes and no arcs '''
+        self.n = n
+        self.head = [[] for i in range(n)]
+        self.to = []
+        self.cap = []
+
+    def add_arc(self, u, v, capacity):
+        ''' add arc (u,v) with its paired reverse arc, returns the arc index '''
+        a = len(self.to)
+        self.head[u].append(a)
+        self.to.append(v)
+        self.cap.append(capacity)
+        self.head[v].append(a + 1)
+        self.to.append(u)
+        self.cap.append(0)
+        return a
+
+def residual(n, arcs, sources, sinks):
+    ''' build the residual network of a flow network with n nodes in a single pass
+        over its arcs given as (node index, neighbor index, capacity). with several
+        sources or sinks a super source and super sink get the indices n and n + 1,
+        a single source and sink are used as they are. returns the residual and the
+        indices to compute the flow between
+    '''
+    if len(sources) == 1 and len(sinks) == 1 and sources[0] != sinks[0]:
+        res = Residual(n)
+        for u, v, capacity in arcs:
+            res.add_arc(u, v, capacity)
+        return res, sources[0], sinks[0]
+    s = n
+    t = n + 1
+    res = Residual(n + 2)
+    inflow = [0] * n
+    outflow = [0] * n
+    for u, v, capacity in arcs:
+        res.add_arc(u, v, capacity)
+        outflow[u] += capacity
+        inflow[v] += capacity
+    #the super source and sink arcs only need to carry what the node itself can pass
+    #on, so bound them by the node's capacity instead of using infinity
+    for i in sources:
+        res.add_arc(s, i, outflow[i])
+    for i in sinks:
+        res.add_arc(i, t, inflow[i])
+    return res, s, t
+
+def edmonds_karp(res, s, t, stats=None, cancel=None):
+    ''' Edmonds-Karp algorithm, augments along shortest paths found by a breadth
+        first search that records the arc used to reach every node. runs in O(V E^2)
+    '''
+    head = res.head
+    to = res.to
+    cap = res.cap
+    total = 0
+    while True:
+        cancel_helper(cancel)
+        if stats is not None:
+            start = stats.clock()
+        parent = [-1] * res.n
+        parent[s] = -2
+        queue = deque([s])
+        while queue and parent[t] == -1:
+            u = queue.popleft()
+            for a in head[u]:
+                if cap[a] > 0 and parent[to[a]] == -1:
+                    parent[to[a]] = a
+                    queue.append(to[a])
+        if stats is not None:
+            waiting = set(queue)
+            scanned = [u for u in range(res.n) if parent[u] != -1 and u not in waiting]
+            stats.record('bfs', start, nodes_scanned=len(scanned), arcs_relaxed=sum([len(head[u]) for u in scanned]))
+            start = stats.clock()
+        if parent[t] == -1:
+            return total
+        #backtrack from sink to source and capture minimum available flow
+        path_flow = float("Inf")
+        v = t
+        while v != s:
+            a = parent[v]
+            path_flow = min(path_flow, cap[a])
+            v = to[a ^ 1]
+        #update the residual capacities
+        v = t
+        while v != s:
+            a = parent[v]
+            cap[a] -= path_flow
+            cap[a ^ 1] += path_flow
+            v = to[a ^ 1]
+        total += path_flow
+        if stats is not None:
+            stats.record('augment', start, augmenting_paths=1)
+
+def dinic(res, s, t, limit=None, stats=None, cancel=None):
+    ''' Dinic's algorithm, repeatedly builds a level graph with a breadth first search
+        and saturates it with a blocking flow found by an iterative depth first search
+        using a current-arc pointer per node. stops early once limit units have been
+        sent if a limit is given. runs in O(V^2 E)
+    '''
+    head = res.head
+    to = res.to
+    cap = res.cap
+    total = 0
+    while limit is None or total < limit:
+        cancel_helper(cancel)
+        if stats is not None:
+            start = stats.clock()
+        #build the level graph from the source
+        level = [-1] * res.n
+        level[s] = 0
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            for a in head[u]:
+                if cap[a] > 0 and level[to[a]] < 0:
+                    level[to[a]] = level[u] + 1
+                    queue.append(to[a])
+        if stats is not None:
+            scanned = [u for u in range(res.n) if level[u] >= 0]
+            stats.record('bfs', start, nodes_scanned=len(scanned), arcs_relaxed=sum([len(head[u]) for u in scanned]))
+            start = stats.clock()
+        if level[t] < 0:
+            return total
+        #find a blocking flow, path holds the arcs from the source to the current node
+        current = [0] * res.n
+        path = []
+        paths = 0
+        u = s
+        while True:
+            if u == t:
+                #augment along the path and retreat to the tail of the first saturated arc
+                path_flow = min([cap[a] for a in path])
+                if limit is not None:
+                    path_flow = min(path_flow, limit - total)
+                total += path_flow
+                if math.isinf(path_flow):
+                    #a path of infinite capacity, the flow is unbounded
+                    return total
+                paths += 1
+                cut = len(path)
+                for i in range(len(path) - 1, -1, -1):
+                    a = path[i]
+                    cap[a] -= path_flow
+                    cap[a ^ 1] += path_flow
+                    if cap[a] == 0:
+                        cut = i
+                del path[cut:]
+                if limit is not None and total >= limit:
+                    if stats is not None:
+                        stats.record('blocking_flow', start, augmenting_paths=paths, arcs_advanced=sum(current))
+                    return total
+                u = to[path[-1]] if path else s
+                continue
+            arcs = head[u]
+            i = current[u]
+            while i < len(arcs):
+                a = arcs[i]
+                if cap[a] > 0 and level[to[a]] == level[u] + 1:
+                    break
+                i += 1
+            current[u] = i
+            if i < len(arcs):
+                path.append(arcs[i])
+                u = to[arcs[i]]
+            elif u == s:
+                break
+            else:
+                #dead end, remove the node from the level graph and retreat
+                level[u] = -1
+                a = path.pop()
+                u = to[a ^ 1]
+                current[u] += 1
+        if stats is not None:
+            stats.record('blocking_flow', start, augmenting_paths=paths, arcs_advanced=sum(current))
+    return total
+
+class Incremental(object):
+    ''' maximum flow that is kept up to date as arcs are added, removed or change
+        capacity. the residual network of the last solution is retained, a capacity
+        increase or a new arc is repaired by augmenting from the current flow and a
+        decrease below the flow on an arc first reroutes the surplus around it, then
+        cancels what cannot be rerouted back to the source and sink. the terminals
+        are fixed, build a new one when the sources or sinks change
+    '''
+
+    def __init__(self, nodes, arcs, sources, sinks, flows=None):
+        ''' solve the flow network with the given nodes and (node, neighbor, capacity)
+            arcs between the given sources and sinks. flows can give the flow on every
+            arc in the order of arcs from a maximum flow that is already known, which
+            is taken as it is instead of solving again
+        '''
+        self.index = {}
+        for node in nodes:
+            self.index[node] = len(self.index)
+        n = len(self.index)
+        self.s = n
+        self.t = n + 1
+        self.res = Residual(n + 2)
+        self.arc = {}
+        self.free = []
+        net = [0] * n
+        for k, (node, neighbor, capacity) in enumerate(arcs):
+            u = self.index[node]
+            v = self.index[neighbor]
+            a = self.res.add_arc(u, v, capacity)
+            self.arc[(node, neighbor)] = a
+            if flows is not None and u != v:
+                self.res.cap[a] = capacity - flows[k]
+                self.res.cap[a + 1] = flows[k]
+                net[u] += flows[k]
+                net[v] -= flows[k]
+        #unbounded super arcs never need repairing when a terminal's capacity changes,
+        #a node without arcs can be both a source and a sink and is left out
+        both = set(sources) & set(sinks)
+        self.value = 0
+        for node in sources:
+            if node not in both:
+                a = self.res.add_arc(self.s, self.index[node], float("Inf"))
+                self.res.cap[a + 1] = net[self.index[node]]
+                self.value += net[self.index[node]]
+        for node in sinks:
+            if node not in both:
+                a = self.res.add_arc(self.index[node], self.t, float("Inf"))
+                self.res.cap[a + 1] = -net[self.index[node]]
+        if flows is None:
+            self.value += dinic(self.res, self.s, self.t)
+
+    def add_node(self, node):
+        ''' add a node without arcs, it carries no flow until arcs are added to it '''
+        self.index[node] = self.res.n
+        self.res.head.append([])
+        self.res.n += 1
+
+    def add_arc(self, node, neighbor, capacity):
+        ''' add a new arc between existing nodes and augment along it. the slots of a
+            removed arc are reused before the residual grows
+        '''
+        u = self.index[node]
+        v = self.index[neighbor]
+        if self.free:
+            res = self.res
+            a = self.free.pop()
+            res.to[a] = v
+            res.to[a + 1] = u
+            res.head[u].append(a)
+            res.head[v].append(a + 1)
+        else:
+            a = self.res.add_arc(u, v, 0)
+        self.arc[(node, neighbor)] = a
+        self.change_capacity(node, neighbor, capacity)
+
+    def remove_arc(self, node, neighbor):
+        ''' remove an arc, once its flow is rerouted or cancelled both slots carry
+            nothing so they are unlinked from their nodes and kept for the next arc
+        '''
+        self.change_capacity(node, neighbor, 0)
+        res = self.res
+        a = self.arc.pop((node, neighbor))
+        res.head[self.index[node]].remove(a)
+        res.head[self.index[neighbor]].remove(a + 1)
+        self.free.append(a)
+
+    def change_capacity(self, node, neighbor, capacity):
+        ''' set the capacity of an arc and repair the maximum flow '''
+        res = self.res
+        a = self.arc[(node, neighbor)]
+        flow = res.cap[a ^ 1]
+        if flow <= capacity:
+            res.cap[a] = capacity - flow
+        else:
+            #keep what fits, send the surplus from the tail around to the head
+            surplus = flow - capacity
+            res.cap[a] = 0
+            res.cap[a ^ 1] = capacity
+            u = self.index[node]
+            v = self.index[neighbor]
+            surplus -= dinic(res, u, v, surplus)
+            if surplus > 0:
+                #the rest is returned to the source and taken back from the sink
+                dinic(res, u, self.s, surplus)
+                dinic(res, self.t, v, surplus)
+                self.value -= surplus
+        self.value += dinic(res, self.s, self.t)
+
+    def flow(self, node, neighbor):
+        ''' returns the flow on an arc '''
+        return self.res.cap[self.arc[(node, neighbor)] ^ 1]
+
+    def read(self, network):
+        ''' returns the flow on every arc of a CSR snapshot of the same network as an
+            array parallel to its targets and the flags of the nodes on the source side
+            of a minimum cut, read off the retained residual network
+        '''
+        names = network.names
+        targets = network.targets
+        cap = self.res.cap
+        flows = array('d')
+        for i in range(len(names)):
+            node = names[i]
+            for k in range(network.offsets[i], network.offsets[i + 1]):
+                flows.append(cap[self.arc[(node, names[targets[k]])] ^ 1])
+        reaches = sink_side(self.res, self.t)
+        side = bytearray(len(names))
+        for i in range(len(names)):
+            side[i] = not reaches[self.index[names[i]]]
+        return flows, side
+
+    def cut_arcs(self):
+        ''' returns the arcs crossing a minimum cut as (node, neighbor, capacity), the
+            arcs from a node that cannot reach the sink in the residual network to one
+            that can
+        '''
+        reaches = sink_side(self.res, self.t)
+        index = self.index
+        cap = self.res.cap
+        arcs = []
+        for (node, neighbor), a in self.arc.items():
+            if not reaches[index[node]] and reaches[index[neighbor]]:
+                arcs.append((node, neighbor, cap[a] + cap[a ^ 1]))
+        return arcs
+
+def push_relabel(res, s, t, stats=None, cancel=None):
+    ''' highest-label push-relabel algorithm with the gap and global relabeling
+        heuristics. the first phase computes the maximum preflow and therefore the
+        value of the maximum flow, the second returns the excess left on nodes that
+        cannot reach the sink to the source so the residual holds a valid flow.
+        runs in O(V^2 sqrt(E))
+    '''
+    n = res.n
+    head = res.head
+    to = res.to
+    cap = res.cap
+    height = [0] * n
+    excess = [0] * n
+    current = [0] * n
+    #saturate every arc out of the source
+    for a in head[s]:
+        if cap[a] > 0:
+            excess[to[a]] += cap[a]
+            cap[a ^ 1] += cap[a]
+            cap[a] = 0
+    relabels = 0
+    pushes = 0
+    gaps = 0
+    highest = -1
+    buckets = None
+    count = None
+    if stats is not None:
+        start = stats.clock()
+    while True:
+        if buckets is None:
+            cancel_helper(cancel)
+            if stats is not None:
+                if count is not None:
+                    stats.record('discharge', start, pushes=pushes, relabels=relabels, gaps=gaps)
+                    pushes = 0
+                    gaps = 0
+                start = stats.clock()
+            #global relabel, exact distances to the sink by a reverse breadth first search
+            for i in range(n):
+                height[i] = n
+                current[i] = 0
+            height[t] = 0
+            queue = deque([t])
+            while queue:
+                v = queue.popleft()
+                for a in head[v]:
+                    u = to[a]
+                    if height[u] == n and u != s and cap[a ^ 1] > 0:
+                        height[u] = height[v] + 1
+                        queue.append(u)
+            buckets = [[] for i in range(n)]
+            count = [0] * n
+            highest = -1
+            for u in range(n):
+                if height[u] < n:
+                    count[height[u]] += 1
+                    if excess[u] > 0 and u != t:
+                        buckets[height[u]].append(u)
+                        highest = max(highest, height[u])
+            relabels = 0
+            if stats is not None:
+                stats.record('global_relabel', start, nodes_scanned=n - height.count(n))
+                start = stats.clock()
+        if highest < 0:
+            if stats is not None:
+                stats.record('discharge', start, pushes=pushes, relabels=relabels, gaps=gaps)
+            return_excess_helper(res, s, t, excess, stats)
+            return excess[t]
+        if not buckets[highest]:
+            highest -= 1
+            continue
+        u = buckets[highest].pop()
+        if height[u] != highest:
+            #lifted out of the bucket by the gap heuristic
+            continue
+        #discharge u
+        arcs = head[u]
+        while excess[u] > 0:
+            i = current[u]
+            while i < len(arcs):
+                a = arcs[i]
+                if cap[a] > 0 and height[to[a]] == height[u] - 1:
+                    break
+                i += 1
+            current[u] = i
+            if i < len(arcs):
+                a = arcs[i]
+                v = to[a]
+                d = min(excess[u], cap[a])
+                if excess[v] == 0 and v != t:
+                    buckets[height[v]].append(v)
+                    highest = max(highest, height[v])
+                cap[a] -= d
+                cap[a ^ 1] += d
+                excess[u] -= d
+                excess[v] += d
+                pushes += 1
+                continue
+            #relabel u to one more than its lowest neighbor in the residual network
+            old = height[u]
+            new = n
+            for a in arcs:
+                if cap[a] > 0 and height[to[a]] + 1 < new:
+                    new = height[to[a]] + 1
+            count[old] -= 1
+            current[u] = 0
+            relabels += 1
+            if count[old] == 0:
+                #gap, nothing above the empty height can reach the sink anymore
+                gaps += 1
+                for v in range(n):
+                    if old < height[v] < n:
+                        count[height[v]] -= 1
+                        height[v] = n
+                height[u] = n
+                break
+            height[u] = new
+            if new >= n:
+                break
+            count[new] += 1
+        if excess[u] > 0 and height[u] < n:
+            buckets[height[u]].append(u)
+            highest = height[u]
+        if relabels > n:
+            buckets = None
+
+def return_excess_helper(res, s, t, excess, stats=None):
+    ''' second phase of push-relabel, pushes the excess of every node back to the
+        source with heights starting at the distance to the source in the residual
+        network. the excess came from the source, so there is always a way back
+    '''
+    if stats is not None:
+        start = stats.clock()
+    n = res.n
+    head = res.head
+    to = res.to
+    cap = res.cap
+    height = [2 * n] * n
+    height[s] = 0
+    queue = deque([s])
+    while queue:
+        v = queue.popleft()
+        for a in head[v]:
+            u = to[a]
+            if height[u] == 2 * n and cap[a ^ 1] > 0:
+                height[u] = height[v] + 1
+                queue.append(u)
+    current = [0] * n
+    active = deque([u for u in range(n) if excess[u] > 0 and u != s and u != t])
+    pushes = 0
+    while active:
+        u = active.popleft()
+        arcs = head[u]
+        while excess[u] > 0:
+            i = current[u]
+            while i < len(arcs):
+                a = arcs[i]
+                if cap[a] > 0 and height[to[a]] == height[u] - 1:
+                    break
+                i += 1
+            current[u] = i
+            if i < len(arcs):
+                a = arcs[i]
+                v = to[a]
+                d = min(excess[u], cap[a])
+                if excess[v] == 0 and v != s and v != t:
+                    active.append(v)
+                cap[a] -= d
+                cap[a ^ 1] += d
+                excess[u] -= d
+                excess[v] += d
+                pushes += 1
+            else:
+                height[u] = 1 + min([height[to[a]] for a in arcs if cap[a] > 0])
+                current[u] = 0
+    if stats is not None:
+        stats.record('return_excess', start, pushes=pushes)
+
+def sink_side(res, t):
+    ''' returns a list of flags marking the nodes that can still reach the sink in the
+        residual network of a maximum flow, found by a reverse breadth first search.
+        every other node is on the source side of a minimum cut
+    '''
+    head = res.head
+    to = res.to
+    cap = res.cap
+    side = [False] * res.n
+    side[t] = True
+    queue = deque([t])
+    while queue:
+        v = queue.popleft()
+        for a in head[v]:
+            u = to[a]
+            if not side[u] and cap[a ^ 1] > 0:
+                side[u] = True
+                queue.append(u)
+    return side
+
+def gomory_hu(n, edges):
+    ''' builds a Gomory-Hu tree of an undirected network with n nodes and edges given
+        as (node index, neighbor index, capacity) using Gusfield's algorithm, which
+        needs only n - 1 max flow computations on one residual network that is reset
+        between them. an undirected edge uses both slots of an arc pair. returns the
+        parent and the weight of the edge to the parent of every node, the root 0 has
+        parent -1. the minimum cut between any two nodes is the smallest weight on the
+        tree path between them
+    '''
+    res = Residual(n)
+    for u, v, capacity in edges:
+        a = res.add_arc(u, v, capacity)
+        res.cap[a + 1] = capacity
+    base = list(res.cap)
+    parent = [0] * n
+    weight = [0] * n
+    if n:
+        parent[0] = -1
+    for i in range(1, n):
+        res.cap[:] = base
+        weight[i] = dinic(res, i, parent[i])
+        side = sink_side(res, parent[i])
+        #nodes on the side of i that hang off the same parent move under i
+        for j in range(i + 1, n):
+            if not side[j] and parent[j] == parent[i]:
+                parent[j] = i
+    return parent, weight
@@ -1,13 +1,21 @@
 class Node(object):
     ''' node object with name, adjacency list represented by a dictionary to store
-        capacities, and indegree the adjacency relationship of (a,b) is "a goes to b"
+        capacities, and indegree the adjacency relationship of (a,b) is "a goes to b".
+        the fields are slots, so a node carries no instance dictionary
     '''
+    __slots__ = ('__name', '__adj_dict', '__in_dict', '__indegree')
+
     def __init__(self, name):
         ''' create base object '''
         self.__name = name
         self.__adj_dict = {}
+        self.__in_dict = {}
         self.__indegree = 0
 
+    def name(self):
+        ''' returns the name of this node '''
+        return self.__name
+
     def add_arc(self, neighbor, capacity):
         ''' add arc to adjacency list '''
         self.__adj_dict[neighbor] = capacity
@@ -19,13 +27,41 @@ class Node(object):
             return True
         return False
 
+    def has_arc(self, neighbor):
+        ''' returns true if there is an arc to neighbor '''
+        return neighbor in self.__adj_dict
+
+    def outdegree(self):
+        ''' returns the number of nodes this node is adjacent to '''
+        return len(self.__adj_dict)
+
+    def add_predecessor(self, node):
+        ''' record that there is an arc from node to this node '''
+        self.__in_dict[node] = None
+
+    def remove_predecessor(self, node):
+        ''' forget the arc from node to this node '''
+        self.__in_dict.pop(node, None)
+
+    def clear_predecessors(self):
+        ''' empty the reverse index so the flow network can rebuild it '''
+        self.__in_dict = {}
+
+    def predecessors(self):
+        ''' returns a live view of the nodes with an arc to this node, None if the
+            reverse index has not been built yet for a node loaded from an older file
+        '''
+        if self.__in_dict is None:
+            return None
+        return self.__in_dict.keys()
+
     def arc_capacity(self, neighbor):
         ''' returns an arc's capacity '''
         return self.__adj_dict[neighbor]
 
     def neighbors(self):
-        ''' returns a list of nodes this vertex is adjacent to '''
-        return list(self.__adj_dict.keys())
+        ''' returns a live view of the nodes this node is adjacent to '''
+        return self.__adj_dict.keys()
 
     def indegree(self):
         ''' returns the number of nodes adjacent to this vertex '''
@@ -39,6 +75,24 @@ class Node(object):
         ''' change capacity for specified edge by inc amount '''
         self.__adj_dict[neighbor] = self.__adj_dict[neighbor] + inc
 
+    def __getstate__(self):
+        ''' pickle the slots as the dictionary older versions pickled '''
+        return {'_Node__name': self.__name, '_Node__adj_dict': self.__adj_dict,
+                '_Node__in_dict': self.__in_dict, '_Node__indegree': self.__indegree}
+
+    def __setstate__(self, state):
+        ''' restore a pickled node, the reverse index of older files is rebuilt by
+            the flow network
+        '''
+        if isinstance(state, tuple):
+            #default slots state of the form (None, slots)
+            state = state[1]
+        if '_Node__in_dict' not in state:
+            state = dict(state)
+            state['_Node__in_dict'] = None
+        for field in state:
+            setattr(self, field, state[field])
+
     def __str__(self):
         ''' string representation of this vertex '''
         result = "Vertex: " + self.__name
@@ -47,4 +101,4 @@ class Node(object):
             arcs.append(self.__name + " -(" + str(self.__adj_dict[neighbor]) + ")-> " + neighbor)
         if len(self.__adj_dict) > 0:
             result = result + "\nAdjacency List: " + ", ".join(arcs)
-        return result
\ No newline at end of file
+        return result
@@ -0,0 +1,52 @@
+from time import perf_counter
+
+class Stats(object):
+    ''' opt-in instrumentation for the graph and flow algorithms. pass a Stats object
+        as the stats argument and every phase the algorithm runs, like a breadth
+        first search or a blocking flow, is recorded with its wall time and counters
+        such as nodes scanned, arcs relaxed or augmenting paths. a trace callback
+        gets every phase as it finishes. the algorithms only check for stats once
+        per phase, so leaving it out costs nothing
+    '''
+
+    def __init__(self, trace=None):
+        ''' create empty statistics, trace is called as trace(phase, seconds, counters) '''
+        self.calls = {}
+        self.seconds = {}
+        self.counts = {}
+        self.trace = trace
+
+    def clock(self):
+        ''' returns the current time for timing a phase '''
+        return perf_counter()
+
+    def record(self, phase, start, **counters):
+        ''' record one run of a phase that started at the given clock() time with its
+            counters, which are added to the totals
+        '''
+        seconds = perf_counter() - start
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        for name in counters:
+            self.counts[name] = self.counts.get(name, 0) + counters[name]
+        if self.trace is not None:
+            self.trace(phase, seconds, counters)
+
+    def __getitem__(self, name):
+        ''' returns the total of a counter, 0 if it was never recorded '''
+        return self.counts.get(name, 0)
+
+    def clear(self):
+        ''' forget everything recorded so far '''
+        self.calls = {}
+        self.seconds = {}
+        self.counts = {}
+
+    def __str__(self):
+        ''' return string representation of the statistics, a line per phase and counter '''
+        lines = []
+        for phase in self.calls:
+            lines.append("%-24s %8d runs %12.6f s" % (phase, self.calls[phase], self.seconds[phase]))
+        for name in self.counts:
+            lines.append("%-24s %12s" % (name, self.counts[name]))
+        return '\n'.join(lines)
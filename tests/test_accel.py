@@ -0,0 +1,84 @@
+import importlib.util
+import random
+import unittest
+import accel
+from flow import Flow
+
+@unittest.skipUnless(importlib.util.find_spec('numpy') and importlib.util.find_spec('scipy'), 'needs numpy and scipy')
+class TestScipyFlow(unittest.TestCase):
+    ''' the scipy max flow against the pure python one on the same snapshots '''
+
+    def setUp(self):
+        ''' hand every snapshot to the backend, whatever its size '''
+        self.min_arcs = accel.MIN_ARCS
+        accel.MIN_ARCS = 1
+
+    def tearDown(self):
+        ''' restore the backend '''
+        accel.MIN_ARCS = self.min_arcs
+        accel.available = None
+
+    def solve_helper(self, network, sources=None, sinks=None):
+        ''' returns the results of the scipy and the pure python dinic '''
+        accel.available = None
+        fast = network.solve('dinic', sources, sinks)
+        accel.available = False
+        slow = network.solve('dinic', sources, sinks)
+        accel.available = None
+        return fast, slow
+
+    def network_helper(self, rng):
+        ''' a random flow network with integer capacities, loops and parallel arcs '''
+        flow = Flow()
+        n = rng.randint(2, 12)
+        for i in range(rng.randint(1, 40)):
+            flow.add_arc(str(rng.randrange(n)), str(rng.randrange(n)), rng.randint(0, 9))
+        return flow
+
+    def test_results_match(self):
+        ''' same value, a valid flow on every arc and a cut as large as the value '''
+        rng = random.Random(3)
+        for trial in range(300):
+            network = self.network_helper(rng).csr()
+            fast, slow = self.solve_helper(network)
+            if slow is False:
+                self.assertIs(fast, False)
+                continue
+            self.assertEqual(fast.value, slow.value)
+            balance = dict.fromkeys(network.names, 0)
+            for k, (node, neighbor, flow) in enumerate(fast.arc_flows()):
+                self.assertGreaterEqual(flow, 0)
+                self.assertLessEqual(flow, network.capacities[k])
+                balance[node] += flow
+                balance[neighbor] -= flow
+            for i in range(len(network.names)):
+                if i not in fast.sources and i not in fast.sinks:
+                    self.assertEqual(balance[network.names[i]], 0)
+            self.assertEqual(sum([capacity for node, neighbor, capacity in fast.cut_arcs()]), fast.value)
+            self.assertEqual(sum([amount for path, amount in fast.paths()]), fast.value)
+
+    def test_single_terminals_match(self):
+        ''' explicit single source and sink give the same value '''
+        rng = random.Random(5)
+        for trial in range(200):
+            network = self.network_helper(rng).csr()
+            if len(network.names) < 2:
+                continue
+            source, sink = rng.sample(list(network.names), 2)
+            fast, slow = self.solve_helper(network, [source], [sink])
+            self.assertEqual(fast.value, slow.value)
+
+    def test_incremental_from_scipy(self):
+        ''' the repaired flow seeded by scipy follows a solve from scratch '''
+        rng = random.Random(9)
+        flow = self.network_helper(rng)
+        for trial in range(100):
+            arc = rng.choice(list(flow.arcs()))
+            flow.add_arc(arc[0], arc[1], rng.randint(0, 9))
+            accel.available = False
+            expected = flow.csr().max_flow()
+            accel.available = None
+            self.assertEqual(flow.max_flow(), expected)
+
+if __name__ == '__main__':
+    unittest.main()
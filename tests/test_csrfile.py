@@ -0,0 +1,79 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+import csrfile
+from graph import Graph
+from flow import Flow
+
+class TestCsrFile(unittest.TestCase):
+    ''' writing snapshots to the binary format and querying them in place '''
+
+    def setUp(self):
+        ''' a directory for the files '''
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'network.csr')
+
+    def tearDown(self):
+        ''' remove the files '''
+        shutil.rmtree(self.directory)
+
+    def test_graph_round_trip(self):
+        ''' the mapped snapshot answers like the graph and loads back the same '''
+        rng = random.Random(12)
+        for trial in range(100):
+            n = rng.randint(1, 15)
+            graph = Graph()
+            for i in range(n):
+                graph.add_vertex('v' + str(i))
+            for i in range(rng.randint(0, 30)):
+                graph.add_edge('v' + str(rng.randrange(n)), 'v' + str(rng.randrange(n)))
+            csrfile.save(graph, self.filename)
+            network = csrfile.open_csr(self.filename)
+            self.assertIsNone(network.capacities)
+            self.assertEqual(list(network.names), list(graph.vertices()))
+            self.assertEqual(network.is_cyclic(), graph.is_cyclic())
+            if not graph.is_cyclic():
+                position = dict([(v, i) for i, v in enumerate(network.topological_sort())])
+                for vertex, neighbor in graph.edges():
+                    self.assertLess(position[neighbor], position[vertex])
+                self.assertEqual([set(wave) for wave in network.levels()], [set(wave) for wave in graph.levels()])
+            copy = csrfile.load_graph(self.filename)
+            self.assertEqual(set(copy.edges()), set(graph.edges()))
+            self.assertEqual(list(copy.vertices()), list(graph.vertices()))
+            del network
+
+    def test_flow_round_trip(self):
+        ''' the mapped snapshot solves like the flow network, terminals included '''
+        rng = random.Random(13)
+        for trial in range(100):
+            n = rng.randint(2, 12)
+            flow = Flow()
+            for i in range(n):
+                flow.add_node(str(i))
+            for i in range(rng.randint(1, 30)):
+                flow.add_arc(str(rng.randrange(n)), str(rng.randrange(n)), float(rng.randint(0, 9)))
+            if rng.random() < 0.5:
+                flow.set_terminals(['0'], [str(n - 1)])
+            csrfile.save(flow, self.filename)
+            network = csrfile.open_csr(self.filename)
+            self.assertEqual(network.max_flow(), flow.max_flow())
+            result = network.solve('push_relabel')
+            if result is not False:
+                self.assertEqual(sum([c for node, neighbor, c in result.cut_arcs()]), flow.max_flow())
+            copy = csrfile.load_flow(self.filename)
+            self.assertEqual(set(copy.arcs()), set(flow.arcs()))
+            self.assertEqual(copy.terminals, flow.terminals)
+            self.assertEqual(copy.max_flow(), flow.max_flow())
+            del network, result
+
+    def test_not_a_csr_file(self):
+        ''' other files are recognized and refused '''
+        with open(self.filename, 'w') as output:
+            output.write('a\tb\n')
+        self.assertFalse(csrfile.is_csr_file(self.filename))
+        self.assertRaises(ValueError, csrfile.open_csr, self.filename)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+import edgelist
+from graph import Graph
+from flow import Flow
+
+NAMES = ['a', 'b c', 'x#y', '7', 'long name here', 'é']
+
+def graph_helper(rng):
+    ''' a random graph with lone vertices and names with spaces '''
+    graph = Graph()
+    for i in range(rng.randint(0, 10)):
+        graph.add_edge(rng.choice(NAMES), rng.choice(NAMES))
+    for i in range(rng.randint(0, 2)):
+        graph.add_vertex(rng.choice(NAMES) + '!')
+    return graph
+
+def flow_helper(rng):
+    ''' a random flow network with lone nodes and float capacities '''
+    flow = Flow()
+    for i in range(rng.randint(1, 10)):
+        flow.add_arc(rng.choice(NAMES), rng.choice(NAMES), rng.choice([1.0, 2.5, 1 / 3, 7.0]))
+    for i in range(rng.randint(0, 2)):
+        flow.add_node(rng.choice(NAMES) + '!')
+    return flow
+
+class TestEdgeList(unittest.TestCase):
+    ''' writing and reading back the text formats '''
+
+    def setUp(self):
+        ''' a directory for the files '''
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        ''' remove the files '''
+        shutil.rmtree(self.directory)
+
+    def test_graph_round_trip(self):
+        ''' the same vertices and edges come back '''
+        rng = random.Random(9)
+        for trial in range(100):
+            graph = graph_helper(rng)
+            output = io.StringIO()
+            edgelist.write_graph(graph, output)
+            copy = edgelist.read_graph(io.StringIO(output.getvalue()))
+            self.assertEqual(set(copy.vertices()), set(graph.vertices()))
+            self.assertEqual(set(copy.edges()), set(graph.edges()))
+            self.assertEqual(copy.cycle_detected(), graph.cycle_detected())
+
+    def test_flow_round_trip(self):
+        ''' the same nodes, arcs and capacities come back '''
+        rng = random.Random(10)
+        for trial in range(100):
+            flow = flow_helper(rng)
+            output = io.StringIO()
+            edgelist.write_flow(flow, output)
+            copy = edgelist.read_flow(io.StringIO(output.getvalue()))
+            self.assertEqual(set(copy.nodes()), set(flow.nodes()))
+            self.assertEqual(set(copy.arcs()), set(flow.arcs()))
+            self.assertEqual(copy.max_flow(), flow.max_flow())
+
+    def test_dimacs_round_trip(self):
+        ''' the names, capacities and max flow come back, isolated nodes included '''
+        rng = random.Random(11)
+        for trial in range(100):
+            flow = flow_helper(rng)
+            filename = os.path.join(self.directory, 'flow.max')
+            edgelist.save_flow(flow, filename)
+            copy = edgelist.load_flow(filename)
+            self.assertEqual(set(copy.nodes()), set(flow.nodes()))
+            self.assertEqual(set(copy.arcs()), set(flow.arcs()))
+            self.assertEqual(copy.max_flow(), flow.max_flow())
+            for algorithm in ['push_relabel', 'edmonds_karp']:
+                self.assertAlmostEqual(copy.max_flow(algorithm), copy.max_flow(), places=9)
+
+    def test_dimacs_terminals(self):
+        ''' marked terminals are stored, kept on saving and refused in an arc list '''
+        lines = ['p max 4 4\n', 'n 1 s\n', 'n 4 t\n', 'a 1 2 3\n', 'a 2 4 4\n', 'a 1 3 1\n', 'a 3 4 5\n']
+        flow, sources, sinks = edgelist.read_dimacs(lines)
+        self.assertEqual((sources, sinks), (['1'], ['4']))
+        self.assertEqual(flow.max_flow(), 4.0)
+        flow.add_arc('4', '1', 2)
+        self.assertEqual(flow.max_flow(), 4.0)
+        filename = os.path.join(self.directory, 'flow.max')
+        edgelist.save_flow(flow, filename)
+        self.assertEqual(edgelist.load_flow(filename).terminals, (['1'], ['4']))
+        filename = os.path.join(self.directory, 'flow.flw')
+        self.assertRaises(ValueError, edgelist.save_flow, flow, filename)
+        self.assertFalse(os.path.exists(filename))
+        self.assertRaises(ValueError, edgelist.read_dimacs, ['p max 2 1\n', 'n 1 s\n', 'n 1 t\n', 'a 1 2 1\n'])
+
+    def test_unwritable_names(self):
+        ''' names that would be read back differently are refused '''
+        for name in ['#comment', ' #x', 'tab\there', 'new\nline', '']:
+            graph = Graph()
+            graph.add_edge(name, 'b')
+            self.assertRaises(ValueError, edgelist.write_graph, graph, io.StringIO())
+
+if __name__ == '__main__':
+    unittest.main()
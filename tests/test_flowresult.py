@@ -0,0 +1,47 @@
+import random
+import unittest
+from flow import Flow
+
+class TestPaths(unittest.TestCase):
+    ''' the decomposition of a max flow into paths '''
+
+    def network_helper(self, rng, capacities):
+        ''' a random flow network over a few nodes with capacities from a list '''
+        flow = Flow()
+        n = rng.randint(2, 9)
+        for i in range(rng.randint(1, 25)):
+            node = rng.randrange(n)
+            neighbor = rng.randrange(n)
+            if node != neighbor:
+                flow.add_arc(str(node), str(neighbor), rng.choice(capacities))
+        return flow
+
+    def test_paths_add_up_with_float_capacities(self):
+        ''' rounding residue must not make the decomposition drop flow '''
+        rng = random.Random(7)
+        for trial in range(500):
+            flow = self.network_helper(rng, [0.1, 1 / 3, 0.7, 0.2, 1.1, 2.5, 0.3])
+            for algorithm in ['dinic', 'push_relabel', 'edmonds_karp']:
+                result = flow.solve(algorithm)
+                if result is False:
+                    continue
+                total = sum([amount for path, amount in result.paths()])
+                self.assertAlmostEqual(total, result.value, places=9)
+
+    def test_paths_run_from_source_to_sink(self):
+        ''' every path starts at a source, ends at a sink and follows arcs '''
+        rng = random.Random(11)
+        for trial in range(200):
+            flow = self.network_helper(rng, [1.0, 2.0, 3.0, 5.0])
+            result = flow.solve()
+            if result is False:
+                continue
+            for path, amount in result.paths():
+                self.assertIn(path[0], flow.sources())
+                self.assertIn(path[-1], flow.sinks())
+                self.assertGreater(amount, 0)
+                for node, neighbor in zip(path, path[1:]):
+                    self.assertTrue(flow.get_node(node).has_arc(neighbor))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import random
+import unittest
+from graph import Graph
+
+def reference_cyclic(vertices, edges):
+    ''' cycle check from scratch, peeling off vertices nothing depends on '''
+    indegree = dict.fromkeys(vertices, 0)
+    following = dict([(v, []) for v in vertices])
+    for vertex, neighbor in edges:
+        indegree[neighbor] += 1
+        following[vertex].append(neighbor)
+    queue = [v for v in vertices if indegree[v] == 0]
+    for v in queue:
+        for w in following[v]:
+            indegree[w] -= 1
+            if indegree[w] == 0:
+                queue.append(w)
+    return len(queue) < len(vertices)
+
+class TestDynamicOrder(unittest.TestCase):
+    ''' the order the graph maintains as it is edited, checked against a from
+        scratch cycle check after every edit
+    '''
+
+    def check_helper(self, graph):
+        ''' compare the graph with a cycle check and orders built from scratch '''
+        vertices = list(graph.vertices())
+        edges = list(graph.edges())
+        cyclic = reference_cyclic(vertices, edges)
+        self.assertEqual(graph.cycle_detected(), cyclic)
+        self.assertEqual(graph.is_cyclic(), cyclic)
+        self.assertEqual(len(edges), graph.size())
+        for edge in graph.cycle_edges:
+            self.assertIn(edge, graph.edges())
+        order = graph.topological_sort()
+        if not cyclic:
+            self.assertEqual(sorted(order, key=str), sorted(vertices, key=str))
+            for method in ['dynamic', 'dfs', 'kahn']:
+                position = dict([(v, i) for i, v in enumerate(graph.topological_sort(method))])
+                for vertex, neighbor in edges:
+                    self.assertLess(position[neighbor], position[vertex])
+        else:
+            #the order still respects every edge that was not parked as closing a cycle
+            position = graph.topo_index
+            for vertex, neighbor in edges:
+                if (vertex, neighbor) not in graph.cycle_edges:
+                    self.assertLess(position[neighbor], position[vertex])
+
+    def edit_helper(self, rng, graph, n):
+        ''' make one random edit '''
+        op = rng.random()
+        edges = list(graph.edges())
+        if op < 0.5:
+            vertex, neighbor = rng.randrange(n), rng.randrange(n)
+            if not graph.cycle_detected():
+                vertices = set(graph.vertices()) | set([vertex, neighbor])
+                expected = reference_cyclic(vertices, set(edges) | set([(vertex, neighbor)]))
+                self.assertEqual(graph.creates_cycle(vertex, neighbor), expected)
+            graph.add_edge(vertex, neighbor)
+        elif op < 0.8 and edges:
+            graph.remove_edge(*rng.choice(edges))
+        elif op < 0.9:
+            graph.remove_vertex(rng.randrange(n))
+        else:
+            graph.add_vertex(rng.randrange(n))
+
+    def test_random_edits(self):
+        ''' random edits of small graphs '''
+        rng = random.Random(6)
+        for trial in range(200):
+            n = rng.randint(2, 12)
+            graph = Graph()
+            for step in range(40):
+                self.edit_helper(rng, graph, n)
+                self.check_helper(graph)
+
+    def test_many_parked_edges(self):
+        ''' removals that leave more than a handful of parked cycle edges defer one
+            rebuild of the order, which must give the same answers
+        '''
+        rng = random.Random(8)
+        for trial in range(20):
+            n = 60
+            graph = Graph.from_edges([(i, (i + 1) % n) for i in range(n)])
+            for step in range(150):
+                graph.add_edge(rng.randrange(n), rng.randrange(n))
+            self.assertTrue(len(graph.cycle_edges) > 16)
+            for step in range(100):
+                edges = list(graph.edges())
+                graph.remove_edge(*rng.choice(edges))
+                if step % 10 == 0:
+                    self.check_helper(graph)
+            self.check_helper(graph)
+
+    def test_bulk_matches_edge_by_edge(self):
+        ''' a graph built in one pass agrees with one built an edge at a time '''
+        rng = random.Random(4)
+        for trial in range(100):
+            n = rng.randint(1, 15)
+            edges = [(rng.randrange(n), rng.randrange(n)) for i in range(rng.randint(0, 30))]
+            bulk = Graph.from_edges(edges)
+            single = Graph()
+            for vertex, neighbor in edges:
+                single.add_edge(vertex, neighbor)
+            self.assertEqual(set(bulk.edges()), set(single.edges()))
+            self.assertEqual(bulk.cycle_detected(), single.cycle_detected())
+            self.check_helper(bulk)
+
+if __name__ == '__main__':
+    unittest.main()
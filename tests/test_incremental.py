@@ -0,0 +1,105 @@
+import random
+import unittest
+from flow import Flow
+
+def reference_max_flow(flow):
+    ''' max flow of a copy of the network solved from scratch '''
+    copy = Flow()
+    for node in flow.nodes():
+        copy.add_node(node)
+    copy.add_arcs_from(list(flow.arcs()))
+    if flow.terminals is not None:
+        copy.set_terminals(*flow.terminals)
+    return copy.csr().max_flow('edmonds_karp')
+
+class TestIncremental(unittest.TestCase):
+    ''' the max flow repaired after every edit against a solve from scratch '''
+
+    def edit_helper(self, rng, flow, n):
+        ''' make one random edit '''
+        op = rng.random()
+        arcs = list(flow.arcs())
+        if op < 0.3 and arcs:
+            node, neighbor, capacity = rng.choice(arcs)
+            flow.change_capacity(node, neighbor, float(rng.randint(-int(capacity), 10)))
+        elif op < 0.5 and arcs:
+            node, neighbor, capacity = rng.choice(arcs)
+            flow.add_arc(node, neighbor, float(rng.randint(0, 20)))
+        elif op < 0.75:
+            flow.add_arc(str(rng.randrange(n)), str(rng.randrange(n)), float(rng.randint(0, 20)))
+        elif op < 0.9 and arcs:
+            node, neighbor, capacity = rng.choice(arcs)
+            flow.remove_arc(node, neighbor)
+        elif op < 0.95:
+            flow.add_node(str(rng.randrange(n + 3)))
+        else:
+            flow.remove_node(str(rng.randrange(n)))
+
+    def check_helper(self, flow):
+        ''' the repaired value, flows and cut against a solve from scratch '''
+        expected = reference_max_flow(flow)
+        self.assertEqual(flow.max_flow(), expected)
+        result = flow.solve()
+        if expected is False:
+            self.assertIs(result, False)
+            return
+        balance = dict.fromkeys(flow.nodes(), 0.0)
+        for node, neighbor, amount in result.arc_flows():
+            self.assertGreaterEqual(amount, 0)
+            self.assertLessEqual(amount, flow.get_node(node).arc_capacity(neighbor))
+            balance[node] += amount
+            balance[neighbor] -= amount
+        for i in range(len(result.network.names)):
+            if i not in result.sources and i not in result.sinks:
+                self.assertEqual(balance[result.network.names[i]], 0)
+        self.assertEqual(sum([capacity for node, neighbor, capacity in result.cut_arcs()]), expected)
+
+    def test_random_edits(self):
+        ''' random edits with the default terminals '''
+        rng = random.Random(16)
+        for trial in range(150):
+            n = rng.randint(2, 10)
+            flow = Flow()
+            for i in range(rng.randint(1, 25)):
+                flow.add_arc(str(rng.randrange(n)), str(rng.randrange(n)), float(rng.randint(0, 20)))
+            for step in range(20):
+                self.check_helper(flow)
+                self.edit_helper(rng, flow, n)
+
+    def test_stored_terminals(self):
+        ''' random arc edits between stored terminals '''
+        rng = random.Random(17)
+        for trial in range(100):
+            n = rng.randint(3, 10)
+            flow = Flow()
+            for i in range(n):
+                flow.add_node(str(i))
+            for i in range(rng.randint(1, 25)):
+                flow.add_arc(str(rng.randrange(n)), str(rng.randrange(n)), float(rng.randint(0, 20)))
+            flow.set_terminals(['0'], [str(n - 1)])
+            for step in range(20):
+                self.check_helper(flow)
+                self.edit_helper(rng, flow, n)
+                if flow.terminals is None:
+                    break
+
+    def test_residual_does_not_grow(self):
+        ''' removing and adding arcs back reuses their slots in the residual network '''
+        rng = random.Random(1)
+        flow = Flow()
+        for i in range(60):
+            flow.add_arc(str(rng.randrange(10)), str(rng.randrange(10, 20)), rng.randint(1, 9))
+        flow.max_flow()
+        size = len(flow.incremental.res.to)
+        for step in range(2000):
+            node, neighbor, capacity = rng.choice(list(flow.arcs()))
+            flow.remove_arc(node, neighbor)
+            flow.add_arc(node, neighbor, rng.randint(1, 9))
+            if flow.incremental is None:
+                flow.max_flow()
+                size = len(flow.incremental.res.to)
+        self.assertLessEqual(len(flow.incremental.res.to), size)
+        self.assertEqual(flow.max_flow(), reference_max_flow(flow))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import pickle
+import random
+import unittest
+from graph import Graph
+from flow import Flow
+
+class TestPickle(unittest.TestCase):
+    ''' graphs and flow networks pickled as name tables and arrays '''
+
+    def test_graph(self):
+        ''' the edges, order and cycle edges come back and edits keep working '''
+        rng = random.Random(23)
+        for trial in range(100):
+            n = rng.randint(1, 12)
+            graph = Graph()
+            for i in range(rng.randint(0, 30)):
+                graph.add_edge(rng.randrange(n), rng.randrange(n))
+            for i in range(rng.randint(0, 5)):
+                edges = list(graph.edges())
+                if edges:
+                    graph.remove_edge(*rng.choice(edges))
+            copy = pickle.loads(pickle.dumps(graph))
+            self.assertEqual(list(copy.vertices()), list(graph.vertices()))
+            self.assertEqual(set(copy.edges()), set(graph.edges()))
+            self.assertEqual(copy.size(), graph.size())
+            self.assertEqual(copy.cycle_detected(), graph.cycle_detected())
+            self.assertEqual(set(copy.cycle_edges), set(graph.cycle_edges))
+            self.assertEqual(copy.topological_sort(), graph.topological_sort())
+            for i in range(10):
+                vertex, neighbor = rng.randrange(n + 2), rng.randrange(n + 2)
+                copy.add_edge(vertex, neighbor)
+                graph.add_edge(vertex, neighbor)
+                self.assertEqual(copy.cycle_detected(), graph.is_cyclic())
+            vertex = rng.randrange(n)
+            copy.remove_vertex(vertex)
+            graph.remove_vertex(vertex)
+            self.assertEqual(set(copy.edges()), set(graph.edges()))
+            self.assertEqual(copy.cycle_detected(), graph.is_cyclic())
+
+    def test_flow(self):
+        ''' the arcs, capacities and terminals come back and solve the same '''
+        rng = random.Random(24)
+        for trial in range(100):
+            n = rng.randint(2, 12)
+            flow = Flow()
+            for i in range(n):
+                flow.add_node(str(i))
+            for i in range(rng.randint(1, 30)):
+                flow.add_arc(str(rng.randrange(n)), str(rng.randrange(n)), rng.choice([rng.randint(0, 9), rng.random()]))
+            if rng.random() < 0.5:
+                flow.set_terminals(['0'], [str(n - 1)])
+            copy = pickle.loads(pickle.dumps(flow))
+            self.assertEqual(list(copy.nodes()), list(flow.nodes()))
+            self.assertEqual(list(copy.arcs()), list(flow.arcs()))
+            self.assertEqual(set(copy.sources()), set(flow.sources()))
+            self.assertEqual(set(copy.sinks()), set(flow.sinks()))
+            self.assertEqual(copy.terminals, flow.terminals)
+            self.assertEqual(copy.max_flow(), flow.max_flow())
+            node = str(rng.randrange(n))
+            copy.remove_node(node)
+            flow.remove_node(node)
+            self.assertEqual(copy.max_flow(), flow.max_flow())
+
+if __name__ == '__main__':
+    unittest.main()
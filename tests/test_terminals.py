@@ -0,0 +1,100 @@
+import random
+import unittest
+from flow import Flow
+
+ALGORITHMS = ['dinic', 'push_relabel', 'edmonds_karp']
+
+def network_helper(rng, n, m):
+    ''' a random flow network over the nodes 0..n-1 '''
+    flow = Flow()
+    for i in range(n):
+        flow.add_node(i)
+    for i in range(m):
+        flow.add_arc(rng.randrange(n), rng.randrange(n), rng.randint(0, 9))
+    return flow
+
+def reference_max_flow(flow, sources, sinks):
+    ''' max flow with a super source and super sink added as real nodes, so only a
+        single source and sink are left
+    '''
+    copy = Flow()
+    copy.add_arcs_from(list(flow.arcs()))
+    unbounded = sum([capacity for node, neighbor, capacity in flow.arcs()]) + 1
+    for node in sources:
+        copy.add_arc('source', node, unbounded)
+    for node in sinks:
+        copy.add_arc(node, 'sink', unbounded)
+    return copy.csr().max_flow('edmonds_karp', ['source'], ['sink'])
+
+class TestTerminals(unittest.TestCase):
+    ''' max flows between explicit sources and sinks '''
+
+    def test_explicit_terminals(self):
+        ''' every algorithm against materialized super nodes '''
+        rng = random.Random(19)
+        for trial in range(300):
+            n = rng.randint(2, 10)
+            flow = network_helper(rng, n, rng.randint(1, 30))
+            nodes = list(flow.nodes())
+            rng.shuffle(nodes)
+            k = rng.randint(2, n)
+            split = rng.randint(1, k - 1)
+            sources, sinks = nodes[:split], nodes[split:k]
+            expected = reference_max_flow(flow, sources, sinks)
+            for algorithm in ALGORITHMS:
+                self.assertEqual(flow.max_flow(algorithm, sources, sinks), expected)
+                result = flow.solve(algorithm, sources, sinks)
+                self.assertEqual(sum([c for node, neighbor, c in result.cut_arcs()]), expected)
+
+    def test_stored_terminals(self):
+        ''' stored terminals are used by default and fill in a side that is not given '''
+        rng = random.Random(20)
+        for trial in range(100):
+            n = rng.randint(3, 10)
+            flow = network_helper(rng, n, rng.randint(1, 30))
+            flow.set_terminals([0], [n - 1, n - 2])
+            self.assertEqual(flow.max_flow(), reference_max_flow(flow, [0], [n - 1, n - 2]))
+            if n > 3:
+                self.assertEqual(flow.max_flow('dinic', [1]), reference_max_flow(flow, [1], [n - 1, n - 2]))
+            else:
+                self.assertRaises(ValueError, flow.max_flow, 'dinic', [1])
+        flow = Flow()
+        flow.add_arc('a', 'b', 1)
+        self.assertRaises(ValueError, flow.set_terminals, ['a'], ['a'])
+
+    def test_pairs(self):
+        ''' max flows of many pairs on one residual network match one by one '''
+        rng = random.Random(21)
+        for trial in range(100):
+            n = rng.randint(2, 10)
+            flow = network_helper(rng, n, rng.randint(1, 30))
+            pairs = []
+            for i in range(5):
+                source, sink = rng.sample(range(n), 2)
+                pairs.append((source, sink))
+            for algorithm in ALGORITHMS:
+                self.assertEqual(flow.max_flows(pairs, algorithm), [reference_max_flow(flow, [s], [t]) for s, t in pairs])
+
+    def test_gomory_hu(self):
+        ''' every pair's min cut in the tree matches a max flow on the undirected network '''
+        rng = random.Random(22)
+        for trial in range(60):
+            n = rng.randint(2, 9)
+            flow = network_helper(rng, n, rng.randint(1, 25))
+            undirected = Flow()
+            for i in range(n):
+                undirected.add_node(i)
+            for node, neighbor, capacity in flow.arcs():
+                if node != neighbor:
+                    for u, v in [(node, neighbor), (neighbor, node)]:
+                        arc = undirected.get_node(u)
+                        previous = arc.arc_capacity(v) if arc.has_arc(v) else 0
+                        undirected.add_arc(u, v, previous + capacity)
+            tree = flow.gomory_hu()
+            self.assertEqual(len(tree.edges()), n - 1)
+            for u in range(n):
+                for v in range(u + 1, n):
+                    self.assertEqual(tree.min_cut(u, v), undirected.max_flow('dinic', [u], [v]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,30 +1,69 @@
 class Vertex(object):
 	''' vertex object with name, adjacency list, and indegree
 		the adjacency relationship of (a,b) is "a depends on b"
+		the adjacency list is kept in an insertion ordered dictionary along with a
+		reverse index of the vertices adjacent to this one, so edges are added and
+		removed in constant time. the fields are slots, so a vertex carries no
+		instance dictionary
 	'''
+	__slots__ = ('__name', '__adj_dict', '__in_dict', '__indegree')
+
 	def __init__(self, name):
 		''' create base object '''
 		self.__name = name
-		self.__adj_list = []
+		self.__adj_dict = {}
+		self.__in_dict = {}
 		self.__indegree = 0
 
+	def name(self):
+		''' returns the name of this vertex '''
+		return self.__name
+
 	def add_edge(self, neighbor):
 		''' add edge to this vertex's adjacency list, return true if edge was added '''
-		if neighbor not in self.__adj_list:
-			self.__adj_list.append(neighbor)
+		if neighbor not in self.__adj_dict:
+			self.__adj_dict[neighbor] = None
 			return True
 		return False
 
 	def remove_edge(self, neighbor):
 		''' remove edge from this vertex's adjacency list, return true if edge was removed '''
-		if neighbor in self.__adj_list:
-			self.__adj_list.remove(neighbor)
+		if neighbor in self.__adj_dict:
+			del self.__adj_dict[neighbor]
 			return True
 		return False
 
+	def has_edge(self, neighbor):
+		''' returns true if this vertex is adjacent to neighbor '''
+		return neighbor in self.__adj_dict
+
 	def neighbors(self):
-		''' returns a list of vertices this vertex is adjacent to '''
-		return self.__adj_list
+		''' returns a live view of the vertices this vertex is adjacent to '''
+		return self.__adj_dict.keys()
+
+	def outdegree(self):
+		''' returns the number of vertices this vertex is adjacent to '''
+		return len(self.__adj_dict)
+
+	def add_predecessor(self, vertex):
+		''' record that vertex is adjacent to this vertex '''
+		self.__in_dict[vertex] = None
+
+	def remove_predecessor(self, vertex):
+		''' forget that vertex is adjacent to this vertex '''
+		self.__in_dict.pop(vertex, None)
+
+	def clear_predecessors(self):
+		''' empty the reverse index so the graph can rebuild it '''
+		self.__in_dict = {}
+
+	def predecessors(self):
+		''' returns a live view of the vertices adjacent to this vertex, None if the
+			reverse index has not been built yet for a vertex loaded from an older file
+		'''
+		if self.__in_dict is None:
+			return None
+		return self.__in_dict.keys()
 
 	def indegree(self):
 		''' returns the number of vertices adjacent to this vertex '''
@@ -34,9 +73,28 @@ class Vertex(object):
 		''' helper function to change the indegree from the graph datastructure '''
 		self.__indegree = self.__indegree + x
 
+	def __getstate__(self):
+		''' pickle the slots as the dictionary older versions pickled '''
+		return {'_Vertex__name': self.__name, '_Vertex__adj_dict': self.__adj_dict,
+			'_Vertex__in_dict': self.__in_dict, '_Vertex__indegree': self.__indegree}
+
+	def __setstate__(self, state):
+		''' restore a pickled vertex, converting the adjacency list of older files.
+			the reverse index of older files is rebuilt by the graph
+		'''
+		if isinstance(state, tuple):
+			#default slots state of the form (None, slots)
+			state = state[1]
+		if '_Vertex__adj_list' in state:
+			state = dict(state)
+			state['_Vertex__adj_dict'] = dict.fromkeys(state.pop('_Vertex__adj_list'))
+			state['_Vertex__in_dict'] = None
+		for field in state:
+			setattr(self, field, state[field])
+
 	def __str__(self):
 		''' string representation of this vertex '''
 		result = "Vertex: " + self.__name + " | In Degree: " + str(self.__indegree)
-		if len(self.__adj_list) > 0:
-			result = result + "\nAdjacency List: " + ", ".join(self.__adj_list)
+		if len(self.__adj_dict) > 0:
+			result = result + "\nAdjacency List: " + ", ".join(self.__adj_dict)
 		return result
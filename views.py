@@ -0,0 +1,61 @@
+class EdgeView(object):
+    ''' live view of the edges of a dependency graph as (vertex, neighbor) pairs.
+        nothing is copied, iteration walks the adjacency lists, the length is the
+        graph's edge count and membership looks up a single adjacency list, so the
+        view always shows the graph as it is now
+    '''
+
+    def __init__(self, graph):
+        ''' create a view of the edges of graph '''
+        self.graph = graph
+
+    def __len__(self):
+        ''' returns the number of edges '''
+        return self.graph.edge_count
+
+    def __iter__(self):
+        ''' generator of the edges in vertex insertion order '''
+        graph_dict = self.graph.graph_dict
+        for vertex in graph_dict:
+            for neighbor in graph_dict[vertex].neighbors():
+                yield (vertex, neighbor)
+
+    def __contains__(self, edge):
+        ''' returns true if the graph has the edge (vertex, neighbor) '''
+        vertex = self.graph.get_vertex(edge[0])
+        return vertex is not None and vertex.has_edge(edge[1])
+
+    def __str__(self):
+        ''' string representation of the edges '''
+        return str(list(self))
+
+class ArcView(object):
+    ''' live view of the arcs of a flow network as (node, neighbor, capacity) triples.
+        nothing is copied, iteration walks the adjacency lists, the length is the
+        network's arc count and membership looks up a single adjacency list
+    '''
+
+    def __init__(self, flow):
+        ''' create a view of the arcs of flow '''
+        self.flow = flow
+
+    def __len__(self):
+        ''' returns the number of arcs '''
+        return self.flow.arc_count
+
+    def __iter__(self):
+        ''' generator of the arcs in node insertion order '''
+        flow_dict = self.flow.flow_dict
+        for node in flow_dict:
+            n = flow_dict[node]
+            for neighbor in n.neighbors():
+                yield (node, neighbor, n.arc_capacity(neighbor))
+
+    def __contains__(self, arc):
+        ''' returns true if the network has the arc (node, neighbor, capacity) '''
+        node = self.flow.get_node(arc[0])
+        return node is not None and node.has_arc(arc[1]) and node.arc_capacity(arc[1]) == arc[2]
+
+    def __str__(self):
+        ''' string representation of the arcs '''
+        return str(list(self))
@@ -0,0 +1,162 @@
+import tkinter as tk
+
+class VirtualList(tk.Frame):
+    ''' scrollable list that only renders the rows in view. the rows are kept in a
+        list of items and a format function turns an item into its text. single edits
+        insert, delete or replace rows in place and only the rows in view are drawn
+        again, so refreshing after an edit costs the height of the list instead of
+        the number of items. selections are kept by item, so they survive scrolling
+        and changes elsewhere in the list, and are dropped with their items
+    '''
+
+    def __init__(self, master, items=(), format=str, height=10, **options):
+        ''' create the list inside master, extra options configure the listbox '''
+        tk.Frame.__init__(self, master, borderwidth=0)
+        self.items = list(items)
+        self.format = format
+        self.rows = height
+        self.top = 0
+        self.selection = {}
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.listbox = tk.Listbox(self, height=height, exportselection=False, **options)
+        self.listbox.pack(side="left", fill="y", expand=1)
+        self.listbox.bind("<<ListboxSelect>>", self.select_helper)
+        self.listbox.bind("<Configure>", self.configure_helper)
+        self.listbox.bind("<MouseWheel>", self.wheel_helper)
+        self.listbox.bind("<Button-4>", self.wheel_helper)
+        self.listbox.bind("<Button-5>", self.wheel_helper)
+        self.listbox.bind("<Up>", self.key_helper)
+        self.listbox.bind("<Down>", self.key_helper)
+        self.listbox.bind("<Prior>", self.key_helper)
+        self.listbox.bind("<Next>", self.key_helper)
+
+    def bind(self, sequence=None, func=None, add=None):
+        ''' key and mouse bindings go to the listbox that has the focus '''
+        return self.listbox.bind(sequence, func, add)
+
+    def set_items(self, items):
+        ''' show a new sequence of items, keeping the scroll position and the
+            selection of items that are still there
+        '''
+        self.items = list(items)
+        if self.selection:
+            present = set(self.items)
+            for item in list(self.selection):
+                if item not in present:
+                    del self.selection[item]
+        self.refresh()
+
+    def insert(self, item, index=None):
+        ''' add a row for item at index, at the end if no index is given '''
+        if index is None:
+            self.items.append(item)
+        else:
+            self.items.insert(index, item)
+        self.refresh()
+
+    def delete(self, items):
+        ''' remove the rows of an iterable of items along with their selection '''
+        gone = set(items)
+        if not gone:
+            return
+        if len(gone) == 1:
+            item = next(iter(gone))
+            if item in self.items:
+                self.items.remove(item)
+        else:
+            self.items = [item for item in self.items if item not in gone]
+        for item in gone:
+            self.selection.pop(item, None)
+        self.refresh()
+
+    def replace(self, old, new):
+        ''' show new in the row of old, keeping its place and selection '''
+        if old in self.items:
+            self.items[self.items.index(old)] = new
+            if old in self.selection:
+                del self.selection[old]
+                self.selection[new] = None
+            self.refresh()
+
+    def clear(self):
+        ''' show no items '''
+        self.selection = {}
+        self.set_items([])
+
+    def selected(self):
+        ''' returns the selected items '''
+        return list(self.selection)
+
+    def clear_selection(self):
+        ''' unselect every item '''
+        self.selection = {}
+        self.refresh()
+
+    def size(self):
+        ''' returns the number of items '''
+        return len(self.items)
+
+    def refresh(self):
+        ''' render the rows in view, call after the underlying sequence changed '''
+        count = len(self.items)
+        self.top = max(0, min(self.top, count - self.rows))
+        end = min(count, self.top + self.rows)
+        self.listbox.delete(0, 'end')
+        self.listbox.insert('end', *[self.format(self.items[i]) for i in range(self.top, end)])
+        for i in range(self.top, end):
+            if self.items[i] in self.selection:
+                self.listbox.selection_set(i - self.top)
+        if count > 0:
+            self.scrollbar.set(self.top / count, end / count)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, top):
+        ''' make the item at index top the first row in view '''
+        self.top = int(top)
+        self.refresh()
+
+    def yview(self, *args):
+        ''' scrollbar command, handles moveto and scroll requests '''
+        if args[0] == 'moveto':
+            self.scroll_to(float(args[1]) * len(self.items))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self.rows
+            self.scroll_to(self.top + step)
+
+    def select_helper(self, event=None):
+        ''' mirror the listbox selection of the rows in view into the item selection '''
+        chosen = self.listbox.curselection()
+        end = min(len(self.items), self.top + self.rows)
+        for i in range(self.top, end):
+            item = self.items[i]
+            if i - self.top in chosen:
+                self.selection[item] = None
+            else:
+                self.selection.pop(item, None)
+
+    def configure_helper(self, event):
+        ''' render as many rows as fit when the listbox is resized '''
+        bbox = self.listbox.bbox(0)
+        if bbox and bbox[3] > 0:
+            rows = max(1, int(event.height / bbox[3]))
+            if rows != self.rows:
+                self.rows = rows
+                self.refresh()
+
+    def wheel_helper(self, event):
+        ''' scroll three rows per mouse wheel step '''
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self.scroll_to(self.top - 3)
+        else:
+            self.scroll_to(self.top + 3)
+        return "break"
+
+    def key_helper(self, event):
+        ''' scroll by a row or a page with the arrow and page keys '''
+        step = {"Up": -1, "Down": 1, "Prior": -self.rows, "Next": self.rows}[event.keysym]
+        self.scroll_to(self.top + step)
+        return "break"
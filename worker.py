@@ -0,0 +1,92 @@
+import queue
+import threading
+from maxflow import Cancelled
+
+class Worker(object):
+    ''' runs long computations for a tkinter window on a background thread. requests
+        are debounced so a burst of edits only computes once, a newer request under the
+        same key supersedes an older one that has not finished, and results are handed
+        back on the tk main loop with after() so callbacks can touch widgets. every
+        job gets a cancel token that is set when it is superseded, so a job that is
+        already running can stop at its next check instead of holding up the thread
+    '''
+
+    def __init__(self, widget, delay=200, poll=50):
+        ''' create a worker for widget that waits delay milliseconds after the last
+            request before computing and checks for results every poll milliseconds
+        '''
+        self.widget = widget
+        self.delay = delay
+        self.poll = poll
+        self.pending = {}
+        self.generation = {}
+        self.tokens = {}
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.thread = threading.Thread(target=self.run_helper, daemon=True)
+        self.thread.start()
+        self.widget.after(self.poll, self.poll_helper)
+
+    def submit(self, key, snapshot, compute, callback):
+        ''' request that compute(snapshot(), cancel) is run in the background and its
+            result passed to callback. snapshot is called on the main loop when the
+            request starts, so it should return an immutable copy such as a CSR
+            snapshot that the thread can read while the window keeps editing the
+            original. cancel is a threading.Event set once the request is superseded,
+            compute may pass it on to the max flow algorithms or ignore it
+        '''
+        if key in self.pending:
+            self.widget.after_cancel(self.pending[key])
+        self.supersede_helper(key)
+        self.pending[key] = self.widget.after(self.delay, self.start_helper, key, snapshot, compute, callback)
+
+    def cancel(self, key):
+        ''' drop any pending or running request under key '''
+        if key in self.pending:
+            self.widget.after_cancel(self.pending.pop(key))
+        self.supersede_helper(key)
+
+    def supersede_helper(self, key):
+        ''' make the results under key stale and stop its running job '''
+        self.generation[key] = self.generation.get(key, 0) + 1
+        if key in self.tokens:
+            self.tokens.pop(key).set()
+
+    def start_helper(self, key, snapshot, compute, callback):
+        ''' take the snapshot on the main loop and queue the job for the thread '''
+        data = snapshot()
+        token = threading.Event()
+        self.tokens[key] = token
+        self.jobs.put((key, self.generation[key], data, compute, callback, token))
+
+    def run_helper(self):
+        ''' background thread, computes queued jobs that have not been superseded '''
+        while True:
+            key, generation, data, compute, callback, token = self.jobs.get()
+            if token.is_set():
+                continue
+            try:
+                result = compute(data, token)
+                error = None
+            except Cancelled:
+                continue
+            except Exception as e:
+                result = None
+                error = e
+            self.results.put((key, generation, result, error, callback))
+
+    def poll_helper(self):
+        ''' main loop, deliver finished results that are still current '''
+        try:
+            while True:
+                key, generation, result, error, callback = self.results.get_nowait()
+                if generation != self.generation.get(key):
+                    continue
+                self.pending.pop(key, None)
+                if error is not None:
+                    print("Something went terribly wrong: " + str(error))
+                else:
+                    callback(result)
+        except queue.Empty:
+            pass
+        self.widget.after(self.poll, self.poll_helper)